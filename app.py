@@ -1,58 +1,215 @@
 # app.py
 import os
-import json
+import atexit
+import hashlib
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 from datetime import datetime
 from functools import wraps
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory, abort
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory, abort, Response, stream_with_context
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from flask_bcrypt import Bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
+from urllib.parse import quote
+from itertools import islice
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import jwt
+import orjson
 import re
+import sqlite3
+import threading
+import time
+from cachetools import TTLCache, LRUCache
+from sqlalchemy import inspect as sa_inspect, and_, exists, event, func, insert, select, literal, union_all, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import make_transient_to_detached, joinedload, load_only
 from functools import wraps as _wraps
 from flask import g
+from flask.json.provider import DefaultJSONProvider
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
 
 # Import database models
 from models import db, User, Company, ResumeAnalysis, Job, Match, CareerRoadmap, LatexResume, Conversation, Message
 
 # Import resume analyzer core logic
-from core_logic.extractor import extract_text_from_pdf
+from core_logic.extractor import extract_text_from_pdf, extract_text_from_bytes
 from core_logic.analyzer import extract_resume_data
 from core_logic.improver import get_resume_feedback, get_career_roadmap
 from core_logic.ats_scorer import calculate_ats_score, get_profile_enhancement
-from core_logic.matcher import calculate_match_score
+from core_logic.resume_score import calculate_resume_score, calculate_resume_scores, item_count
+from core_logic.matcher import calculate_match_score, calculate_match_scores, prepare_job_features, prepare_resume_features, score_against, score_pairs
 
 # Import LaTeX template
 from latex_template import DEFAULT_TEMPLATE
 
 # --- APP CONFIGURATION ---
+load_dotenv()
+
+# Request threads only enqueue log records; a single listener thread does the
+# formatting and the (possibly slow) write to stderr
+_log_queue = queue.SimpleQueue()
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_output)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_log_input = QueueHandler(_log_queue)
+_log_input.setFormatter(logging.Formatter('%(message)s'))  # final layout is applied by _log_output
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'), handlers=[_log_input])
+logger = logging.getLogger(__name__)
+
+# A flaky backend tends to fail the same way many times in a row: log the full
+# traceback once per minute for each (message, error class), a one-line warning otherwise.
+_logged_failures = TTLCache(maxsize=256, ttl=60)
+_logged_failures_lock = threading.Lock()
+
+
+def log_failure(message, exc):
+    """Log an expected failure, with its traceback only if not seen recently"""
+    key = (message, type(exc))
+    with _logged_failures_lock:
+        seen = key in _logged_failures
+        _logged_failures[key] = True
+    if seen:
+        logger.warning("%s: %s", message, exc)
+    else:
+        logger.error(message, exc_info=exc)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (same output as the default provider)"""
+
+    def _dumpb(self, obj, indent=False, sort_keys=None):
+        # Datetimes go through Flask's default() so they keep the HTTP date format;
+        # numpy scalars from the matcher serialize natively
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+        indent = kwargs.pop('indent', None)
+        kwargs.pop('separators', None)
+        if kwargs:
+            return super().dumps(obj, sort_keys=sort_keys, indent=indent, **kwargs)
+        return self._dumpb(obj, indent=bool(indent), sort_keys=sort_keys).decode()
+
+    def response(self, *args, **kwargs):
+        # jsonify(): hand orjson's bytes straight to the response instead of
+        # decoding them to str for Werkzeug to encode again
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumpb(obj, indent=indent) + b'\n', mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        # Hooks such as the session serializer's object_hook need the stdlib parser
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+
+def _dumps(obj):
+    """Encode a value for one of the JSON text columns"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_loads = orjson.loads
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///database.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+    'pool_pre_ping': True,
+    # db.JSON columns (profile item lists) are encoded/decoded with orjson
+    'json_serializer': _dumps,
+    'json_deserializer': _loads,
+}
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# When set (e.g. /internal-uploads/), resume downloads are handed to nginx via X-Accel-Redirect
+app.config['UPLOAD_ACCEL_PREFIX'] = os.environ.get('UPLOAD_ACCEL_PREFIX')
+# For Apache (mod_xsendfile) / lighttpd: send_from_directory then only emits an X-Sendfile header
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+
 
-# Ensure upload folder exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so readers aren't blocked by the commit lock of writers"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+def insert_ignore_conflicts(model):
+    """INSERT ... ON CONFLICT DO NOTHING for the configured database"""
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model).on_conflict_do_nothing()
+
+
+def relax_commit_durability():
+    """Let the current transaction commit without waiting for its WAL flush.
+
+    Used for cheap, user-repeatable UI state (hide/unhide/reapply). PostgreSQL then
+    flushes these commits in groups in the background; SQLite in WAL mode with
+    synchronous=NORMAL already behaves this way.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("SET LOCAL synchronous_commit TO OFF"))
+
+
+# Ensure upload folder exists (resolved once; uploads are saved relative to it)
+UPLOAD_DIR = Path(app.config['UPLOAD_FOLDER']).resolve()
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize extensions
 db.init_app(app)
-bcrypt = Bcrypt(app)
+bcrypt = Bcrypt(app)  # only used to verify legacy bcrypt hashes
+# Argon2id cost is tunable so dev/staging can log in faster; keep the defaults in production
+password_hasher = PasswordHasher(
+    time_cost=int(os.environ.get('ARGON2_TIME_COST', 2)),
+    memory_cost=int(os.environ.get('ARGON2_MEMORY_COST', 19456)),
+    parallelism=1,
+)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 login_manager.login_message_category = 'info'
+SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
 socketio = SocketIO(
     app, 
     cors_allowed_origins="*",
-    async_mode='threading',
-    logger=True,
-    engineio_logger=True,
-    ping_timeout=10,
-    ping_interval=5
+    async_mode=SOCKETIO_ASYNC_MODE,
+    message_queue=os.environ.get('SOCKETIO_MESSAGE_QUEUE'),
+    # Per-packet/ping logging only while debugging; it is O(clients) writes per heartbeat
+    logger=app.debug,
+    engineio_logger=app.debug,
+    ping_timeout=20,
+    ping_interval=25
 )
 
 # Enable CORS for quick frontend integration (allow credentials)
@@ -72,12 +229,29 @@ def create_jwt_token(user_id, user_type):
     token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return token
 
+# Clients send the same bearer token on every call; remember verified payloads briefly
+# so repeat requests skip the base64/HMAC/JSON work. Expiry is still checked on each hit.
+_decoded_tokens = TTLCache(maxsize=4096, ttl=300)
+_decoded_tokens_lock = threading.Lock()
+
+
 def decode_jwt_token(token):
+    with _decoded_tokens_lock:
+        payload = _decoded_tokens.get(token)
+    if payload is not None:
+        if payload['exp'] > time.time():
+            return payload
+        with _decoded_tokens_lock:
+            _decoded_tokens.pop(token, None)
+        return None
+
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], options={'require': ['exp']})
     except Exception as e:
         return None
+    with _decoded_tokens_lock:
+        _decoded_tokens[token] = payload
+    return payload
 
 def jwt_required(fn):
     @_wraps(fn)
@@ -88,13 +262,11 @@ def jwt_required(fn):
             payload = decode_jwt_token(token)
             if payload:
                 user_id = payload.get('user_id')
-                user_type = payload.get('user_type')
+                user_type = 'company' if payload.get('user_type') == 'company' else 'jobseeker'
                 user = None
                 try:
-                    if user_type == 'company':
-                        user = Company.query.get(user_id)
-                    else:
-                        user = User.query.get(user_id)
+                    # Shares the session user loader's cache, so polling clients skip the SELECT
+                    user = _get_principal(user_type, user_id)
                 except:
                     user = None
                 if user:
@@ -102,15 +274,276 @@ def jwt_required(fn):
                     g.jwt_user = user
                     g.user_id = user.id
                     g.user_type = user.user_type
-                    return fn(*args, **kwargs)
+                    return fn(user, *args, **kwargs)
         return jsonify({'error': 'Unauthorized'}), 401
     return wrapper
 
+def hash_password(password):
+    """Hash a password with Argon2id."""
+    return password_hasher.hash(password)
+
+
+# Verified when an email is unknown so failed logins take the same time either way
+_DUMMY_PASSWORD_HASH = password_hasher.hash('synapse-dummy-password')
+
+
+# Successful verifications are remembered briefly so bursts of logins with the same
+# credentials (token refreshes, several tabs) pay for Argon2 once. Keys are BLAKE2b
+# digests under a per-process random key, so the cache holds nothing reusable offline;
+# a failed or changed hash never hits it.
+_verified_passwords = TTLCache(maxsize=1024, ttl=int(os.environ.get('PASSWORD_VERIFY_CACHE_TTL', 60)))
+_verified_passwords_lock = threading.Lock()
+_verify_cache_key = os.urandom(32)
+
+
+def _check_password_hash(stored_hash, password):
+    """Return (matches, needs_rehash) for a stored Argon2id or legacy bcrypt hash."""
+    stored_hash = stored_hash or ''
+    if stored_hash.startswith('$2'):
+        return bcrypt.check_password_hash(stored_hash, password), True
+
+    cache_key = hashlib.blake2b(
+        stored_hash.encode() + b'\0' + password.encode(), key=_verify_cache_key, digest_size=16
+    ).digest()
+    with _verified_passwords_lock:
+        if cache_key in _verified_passwords:
+            return True, False
+
+    try:
+        password_hasher.verify(stored_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    needs_rehash = password_hasher.check_needs_rehash(stored_hash)
+    if not needs_rehash:
+        with _verified_passwords_lock:
+            _verified_passwords[cache_key] = True
+    return True, needs_rehash
+
+
+def _account_rows_for_email(email):
+    """(user_type, id, password_hash) rows for an email across both account tables."""
+    return db.session.execute(union_all(
+        select(literal('jobseeker'), User.id, User.password_hash).where(User.email == email),
+        select(literal('company'), Company.id, Company.password_hash).where(Company.email == email),
+    )).all()
+
+
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+
+def valid_email(email):
+    """Cheap shape check run before any email lookup hits the database."""
+    return bool(email) and len(email) <= 100 and _EMAIL_RE.fullmatch(email) is not None
+
+
+def email_registered(email):
+    """True if a job seeker or company already uses this email."""
+    # Existence only: no hashes fetched, and LIMIT 1 lets the second branch be skipped
+    return db.session.execute(union_all(
+        select(literal(1)).where(User.email == email),
+        select(literal(1)).where(Company.email == email),
+    ).limit(1)).first() is not None
+
+
+def authenticate(email, password):
+    """Return the User/Company for valid credentials, or None.
+
+    Legacy bcrypt hashes ($2b$...) are still accepted and are transparently
+    upgraded to Argon2id on the first successful login.
+    """
+    rows = _account_rows_for_email(email) if valid_email(email) else None
+    if not rows:
+        _check_password_hash(_DUMMY_PASSWORD_HASH, password)
+        return None
+
+    for user_type, account_id, stored_hash in rows:
+        matches, needs_rehash = _check_password_hash(stored_hash, password)
+        if not matches:
+            continue
+        account = db.session.get(Company if user_type == 'company' else User, account_id)
+        if needs_rehash:
+            account.password_hash = hash_password(password)
+            db.session.commit()
+            invalidate_principal(user_type, account_id)
+        return account
+    return None
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in sorted(ALLOWED_EXTENSIONS))
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # Only the tail is inspected, however long the client-supplied name is
+    return filename[-6:].lower().endswith(_ALLOWED_SUFFIXES)
+
+# Leading bytes each binary upload type must start with (plain text has none)
+_UPLOAD_SIGNATURES = {
+    'pdf': b'%PDF-',
+    'docx': b'PK\x03\x04',
+    'doc': b'\xd0\xcf\x11\xe0',
+}
+
+def upload_content_matches(file):
+    """Peek at an upload's first bytes and check them against its extension.
+
+    Oversized bodies never get this far: MAX_CONTENT_LENGTH makes Werkzeug reject
+    them from the Content-Length header before anything is read.
+    """
+    signature = _UPLOAD_SIGNATURES.get(file.filename.rsplit('.', 1)[-1].lower())
+    if signature is None:
+        return True
+    head = file.stream.read(len(signature))
+    file.stream.seek(0)
+    return head == signature
+
+def resume_upload_path(user_id, filename):
+    """Return the stored name ({user_id}_{filename}) and path for an uploaded resume"""
+    full_filename = f"{user_id}_{secure_filename(filename)}"
+    filepath = UPLOAD_DIR / full_filename
+    if filepath.parent != UPLOAD_DIR:
+        abort(400)
+    return full_filename, filepath
+
+# Stored resume names as produced by resume_upload_path(): {user_id}_{secure name}.{allowed ext}
+_RESUME_FILENAME_RE = re.compile(r'^(\d+)_[\w.\-]+\.(?:pdf|docx?|txt)$', re.IGNORECASE)
+
+def resume_owner_id(filename):
+    """User id encoded in a stored resume name, or None if the name isn't one we issue"""
+    m = _RESUME_FILENAME_RE.match(filename)
+    return int(m.group(1)) if m else None
+
+def build_profile_summary(analysis_result):
+    """Short name/skills/experience summary shown on profile and applicant cards"""
+    skills = analysis_result.get('skills', [])
+    work_exp = analysis_result.get('work_experience', [])
+    personal = analysis_result.get('personal_details', {})
+    
+    profile_summary = ""
+    if personal:
+        profile_summary += f"{personal.get('name', 'Professional')}\n"
+    if skills:
+        skill_list = skills if isinstance(skills, list) else [skills]
+        profile_summary += f"Skills: {', '.join(skill_list[:8])}\n"
+    if work_exp:
+        exp_count = len(work_exp) if isinstance(work_exp, list) else 1
+        profile_summary += f"Experience: {exp_count} position(s)\n"
+    return profile_summary.strip()
+
+
+TOP_SKILLS_SHOWN = 6
+
+def resume_projection(analysis_result):
+    """The summary, score and skill/experience/education counts derived from the
+    extracted resume, as ResumeAnalysis column values"""
+    skills = analysis_result.get('skills') or []
+    skill_list = skills if isinstance(skills, list) else [skills]
+    
+    return {
+        'profile_summary_text': build_profile_summary(analysis_result),
+        'analysis_score': calculate_resume_score(analysis_result),
+        'top_skills': '\n'.join(str(s) for s in skill_list[:TOP_SKILLS_SHOWN])[:255],
+        'skill_count': len(skill_list),
+        'exp_count': item_count(analysis_result.get('work_experience')),
+        'edu_count': item_count(analysis_result.get('education')),
+    }
+
+
+def store_resume_projection(resume_analysis, analysis_result):
+    """Store the resume projection so list pages can render without parsing extracted_json"""
+    for column, value in resume_projection(analysis_result).items():
+        setattr(resume_analysis, column, value)
+
+
+def save_resume_analysis(user_id, values):
+    """Write a user's analysis with one UPDATE, inserting the row only on the first upload"""
+    result = db.session.execute(
+        update(ResumeAnalysis).where(ResumeAnalysis.user_id == user_id).values(**values)
+    )
+    if result.rowcount == 0:
+        db.session.add(ResumeAnalysis(user_id=user_id, **values))
+    db.session.commit()
+
+
+# --- PARSED JSON CACHE ---
+# extracted_json / roadmap_json are re-read on most resume and roadmap endpoints.
+# Parse each stored row version once; the key changes whenever updated_at does.
+_parsed_json_cache = LRUCache(maxsize=1024)
+_parsed_json_cache_lock = threading.Lock()
+
+
+def _cached_json(kind, row, raw, build=orjson.loads):
+    """Parse a JSON column of a row, reusing the result until the row is updated.
+
+    build turns the raw column into the cached value (parsing it by default).
+    The returned object is shared between requests and must not be mutated.
+    """
+    key = (kind, row.id, row.updated_at, len(raw))
+    with _parsed_json_cache_lock:
+        parsed = _parsed_json_cache.get(key)
+    if parsed is None:
+        parsed = build(raw)
+        with _parsed_json_cache_lock:
+            _parsed_json_cache[key] = parsed
+    return parsed
+
+
+def resume_data_of(analysis):
+    """Parsed extracted_json of a ResumeAnalysis (read-only)"""
+    return _cached_json('resume', analysis, analysis.extracted_json)
+
+
+def resume_features_of(analysis):
+    """Matcher-ready text and skills of a ResumeAnalysis, rebuilt only when the resume changes"""
+    return _cached_json('resume-features', analysis, analysis.extracted_json,
+                        lambda raw: prepare_resume_features(resume_data_of(analysis)))
+
+
+# --- MATCH SCORE CACHE ---
+# The card shown by get-next-job is scored again when it is swiped. A score only
+# depends on the resume and job versions, so it is reused until either row changes.
+_match_score_cache = LRUCache(maxsize=10000)
+_match_score_cache_lock = threading.Lock()
+
+
+def cached_match_score(analysis, job):
+    """Match score of a ResumeAnalysis against a job row (id, updated_at, description_text, requirements)"""
+    key = (analysis.id, analysis.updated_at, job.id, job.updated_at)
+    with _match_score_cache_lock:
+        score = _match_score_cache.get(key)
+    if score is None:
+        score = score_against(
+            resume_features_of(analysis),
+            prepare_job_features(job.description_text or '', job.requirements or '')
+        )
+        with _match_score_cache_lock:
+            _match_score_cache[key] = score
+    return score
+
+
+def resume_json_row(user_id):
+    """A user's ResumeAnalysis with only the columns resume_data_of() reads"""
+    return (ResumeAnalysis.query
+            .options(load_only(ResumeAnalysis.extracted_json, ResumeAnalysis.updated_at))
+            .filter_by(user_id=user_id)
+            .first())
+
+
+def roadmap_data_of(roadmap):
+    """Parsed roadmap_json of a CareerRoadmap (read-only)"""
+    return _cached_json('roadmap', roadmap, roadmap.roadmap_json)
+
+
+def roadmap_response(roadmap_json, roadmap_id=None):
+    """Success response that embeds the already-encoded roadmap instead of re-serializing it.
+
+    The envelope and the roadmap are sent as separate chunks so the (possibly large)
+    roadmap string is never copied into a second, concatenated body.
+    """
+    suffix = f',"roadmap_id":{int(roadmap_id)}}}' if roadmap_id is not None else '}'
+    chunks = [b'{"status":"success","roadmap":', roadmap_json.encode(), suffix.encode()]
+    response = Response(chunks, mimetype='application/json')
+    response.content_length = sum(len(chunk) for chunk in chunks)
+    return response
 
 
 # --- CUSTOM JINJA FILTERS ---
@@ -119,22 +552,72 @@ def load_json_filter(json_string):
     """Convert JSON string to Python dict"""
     try:
         if isinstance(json_string, str):
-            return json.loads(json_string)
+            return orjson.loads(json_string)
         return json_string
-    except (json.JSONDecodeError, TypeError):
+    except (orjson.JSONDecodeError, TypeError):
+        return {}
+
+
+@app.template_filter('resume_data')
+def resume_data_filter(analysis):
+    """Parsed extracted_json of a ResumeAnalysis, shared with the API through the parsed JSON cache"""
+    try:
+        return resume_data_of(analysis)
+    except (orjson.JSONDecodeError, TypeError):
         return {}
 
 
 # --- USER LOADER ---
+# Authenticated requests resolve their User/Company on every hit, so keep a
+# short-lived in-process cache of detached row snapshots keyed by (type, id).
+PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 30))
+_principal_cache = TTLCache(maxsize=4096, ttl=PRINCIPAL_CACHE_TTL)
+_principal_cache_lock = threading.Lock()
+
+
+def _snapshot_principal(principal):
+    """Copy the loaded columns of a User/Company into a detached instance."""
+    mapper = sa_inspect(principal).mapper
+    snapshot = mapper.class_(**{attr.key: getattr(principal, attr.key) for attr in mapper.column_attrs})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def _get_principal(user_type, user_id):
+    """Load a User or Company by id, serving repeat lookups from the cache."""
+    key = (user_type, user_id)
+    with _principal_cache_lock:
+        snapshot = _principal_cache.get(key)
+    if snapshot is not None:
+        # merge(load=False) attaches a copy to this request's session without a SELECT
+        return db.session.merge(snapshot, load=False)
+
+    model = Company if user_type == 'company' else User
+    principal = db.session.get(model, user_id)
+    if principal is not None:
+        remember_principal(principal)
+    return principal
+
+
+def remember_principal(principal):
+    """Cache a freshly loaded User/Company, e.g. right after login."""
+    user_type = 'company' if isinstance(principal, Company) else 'jobseeker'
+    with _principal_cache_lock:
+        _principal_cache[(user_type, principal.id)] = _snapshot_principal(principal)
+
+
+def invalidate_principal(user_type, user_id):
+    """Drop a cached User/Company after its row has been modified."""
+    with _principal_cache_lock:
+        _principal_cache.pop((user_type, user_id), None)
+
+
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID. Check both User and Company tables."""
     # Check if it's in session
     user_type = session.get('user_type')
-    if user_type == 'company':
-        return Company.query.get(int(user_id))
-    else:
-        return User.query.get(int(user_id))
+    return _get_principal('company' if user_type == 'company' else 'jobseeker', int(user_id))
 
 
 # --- CUSTOM DECORATORS ---
@@ -166,6 +649,18 @@ def company_required(f):
     return decorated_function
 
 
+def jobseeker_api(f):
+    """Decorator for session-authenticated job seeker JSON endpoints (401/403 instead of redirects)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify({'error': 'Authentication required'}), 401
+        if current_user.user_type != 'jobseeker':
+            return jsonify({'error': 'Unauthorized'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+
 # --- AUTHENTICATION ROUTES ---
 
 @app.route('/')
@@ -189,23 +684,23 @@ def login():
         email = request.form.get('email')
         password = request.form.get('password')
         
-        # Check User table first
-        user = User.query.filter_by(email=email).first()
-        if user and bcrypt.check_password_hash(user.password_hash, password):
-            login_user(user)
-            session['user_type'] = 'jobseeker'
-            flash(f'Welcome back, {user.full_name}!', 'success')
-            next_page = request.args.get('next')
-            return redirect(next_page) if next_page else redirect(url_for('discover'))
-        
-        # Check Company table
-        company = Company.query.filter_by(email=email).first()
-        if company and bcrypt.check_password_hash(company.password_hash, password):
-            login_user(company)
+        # Look the email up in both the User and Company tables at once
+        account = authenticate(email, password)
+        if account:
+            # The next request's user loader will find it without a SELECT
+            remember_principal(account)
+        if isinstance(account, Company):
+            login_user(account)
             session['user_type'] = 'company'
-            flash(f'Welcome back, {company.company_name}!', 'success')
+            flash(f'Welcome back, {account.company_name}!', 'success')
             next_page = request.args.get('next')
             return redirect(next_page) if next_page else redirect(url_for('company_dashboard'))
+        if account:
+            login_user(account)
+            session['user_type'] = 'jobseeker'
+            flash(f'Welcome back, {account.full_name}!', 'success')
+            next_page = request.args.get('next')
+            return redirect(next_page) if next_page else redirect(url_for('discover'))
         
         flash('Invalid email or password. Please try again.', 'danger')
     
@@ -223,13 +718,17 @@ def register_jobseeker():
         password = request.form.get('password')
         full_name = request.form.get('full_name')
         
+        if not valid_email(email):
+            flash('Please enter a valid email address.', 'danger')
+            return redirect(url_for('register_jobseeker'))
+        
         # Check if email already exists
-        if User.query.filter_by(email=email).first() or Company.query.filter_by(email=email).first():
+        if email_registered(email):
             flash('Email already registered. Please use a different email or log in.', 'danger')
             return redirect(url_for('register_jobseeker'))
         
         # Create new user
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        hashed_password = hash_password(password)
         new_user = User(
             email=email,
             password_hash=hashed_password,
@@ -259,13 +758,17 @@ def register_company():
         description = request.form.get('description', '')
         website = request.form.get('website', '')
         
+        if not valid_email(email):
+            flash('Please enter a valid email address.', 'danger')
+            return redirect(url_for('register_company'))
+        
         # Check if email already exists
-        if User.query.filter_by(email=email).first() or Company.query.filter_by(email=email).first():
+        if email_registered(email):
             flash('Email already registered. Please use a different email or log in.', 'danger')
             return redirect(url_for('register_company'))
         
         # Create new company
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        hashed_password = hash_password(password)
         new_company = Company(
             email=email,
             password_hash=hashed_password,
@@ -288,6 +791,7 @@ def register_company():
 @login_required
 def logout():
     """Logout for both user types"""
+    invalidate_principal(current_user.user_type, current_user.id)
     session.pop('user_type', None)
     logout_user()
     flash('You have been logged out successfully.', 'info')
@@ -316,16 +820,14 @@ def api_jwt_login():
     password = data.get('password')
     if not email or not password:
         return jsonify({'error': 'Missing credentials'}), 400
+    if not valid_email(email):
+        return jsonify({'error': 'Invalid email'}), 400
 
-    user = User.query.filter_by(email=email).first()
-    if user and bcrypt.check_password_hash(user.password_hash, password):
-        token = create_jwt_token(user.id, user.user_type)
-        return jsonify({'status': 'success', 'token': token, 'user_id': user.id, 'user_type': user.user_type}), 200
-
-    company = Company.query.filter_by(email=email).first()
-    if company and bcrypt.check_password_hash(company.password_hash, password):
-        token = create_jwt_token(company.id, company.user_type)
-        return jsonify({'status': 'success', 'token': token, 'user_id': company.id, 'user_type': company.user_type}), 200
+    account = authenticate(email, password)
+    if account:
+        remember_principal(account)
+        token = create_jwt_token(account.id, account.user_type)
+        return jsonify({'status': 'success', 'token': token, 'user_id': account.id, 'user_type': account.user_type}), 200
 
     return jsonify({'error': 'Invalid email or password'}), 401
 
@@ -340,13 +842,15 @@ def api_register_jobseeker():
     
     if not email or not password or not name:
         return jsonify({'error': 'Missing required fields: email, password, name'}), 400
+    if not valid_email(email):
+        return jsonify({'error': 'Invalid email'}), 400
     
     # Check if email already exists
-    if User.query.filter_by(email=email).first() or Company.query.filter_by(email=email).first():
+    if email_registered(email):
         return jsonify({'error': 'Email already registered'}), 409
     
     # Create new user
-    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    hashed_password = hash_password(password)
     new_user = User(
         email=email,
         password_hash=hashed_password,
@@ -381,13 +885,15 @@ def api_register_company():
     
     if not email or not password or not company_name:
         return jsonify({'error': 'Missing required fields: email, password, company_name'}), 400
+    if not valid_email(email):
+        return jsonify({'error': 'Invalid email'}), 400
     
     # Check if email already exists
-    if User.query.filter_by(email=email).first() or Company.query.filter_by(email=email).first():
+    if email_registered(email):
         return jsonify({'error': 'Email already registered'}), 409
     
     # Create new company
-    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    hashed_password = hash_password(password)
     new_company = Company(
         email=email,
         password_hash=hashed_password,
@@ -433,21 +939,26 @@ def api_logout():
 
 @app.route('/api/profile', methods=['GET'])
 @jwt_required
-def api_get_profile():
+def api_get_profile(user):
     """Return current user's profile as JSON (JWT-only)."""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    # Get resume analysis if exists
-    resume_analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
+    # Get resume analysis if exists (the user itself comes from the principal cache).
+    # Only the summary columns are read; raw_text and extracted_json stay in the database.
+    resume_analysis = db.session.execute(
+        select(
+            ResumeAnalysis.filename,
+            ResumeAnalysis.ats_score,
+            ResumeAnalysis.target_job_role,
+            (func.coalesce(func.length(ResumeAnalysis.enhancement_recommendations), 0) > 0).label('has_enhancement'),
+            ResumeAnalysis.updated_at,
+        ).where(ResumeAnalysis.user_id == user.id).limit(1)
+    ).first()
     resume_data = None
     if resume_analysis:
         resume_data = {
             'filename': resume_analysis.filename,
             'ats_score': resume_analysis.ats_score,
             'target_job_role': resume_analysis.target_job_role,
-            'has_enhancement': bool(resume_analysis.enhancement_recommendations),
+            'has_enhancement': bool(resume_analysis.has_enhancement),
             'updated_at': resume_analysis.updated_at.isoformat() if resume_analysis.updated_at else None
         }
     
@@ -456,10 +967,10 @@ def api_get_profile():
         'email': user.email,
         'full_name': user.full_name,
         'career_objective': user.career_objective,
-        'projects': json.loads(user.projects) if user.projects else [],
-        'training_courses': json.loads(user.training_courses) if user.training_courses else [],
+        'projects': user.projects or [],
+        'training_courses': user.training_courses or [],
         'portfolio_url': user.portfolio_url,
-        'work_samples': json.loads(user.work_samples) if user.work_samples else [],
+        'work_samples': user.work_samples or [],
         'accomplishments': user.accomplishments,
         'phone': user.phone,
         'location': user.location,
@@ -472,12 +983,9 @@ def api_get_profile():
 
 @app.route('/api/profile', methods=['POST'])
 @jwt_required
-def api_update_profile():
+def api_update_profile(user):
     """Quick JSON profile update (partial fields) - JWT-only."""
     data = request.get_json() or {}
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
     # Update a few allowed fields quickly
     for field in ['full_name', 'career_objective', 'portfolio_url', 'accomplishments', 'phone', 'location', 'linkedin_url', 'github_url']:
         if field in data:
@@ -485,36 +993,37 @@ def api_update_profile():
 
     # For simple lists accept arrays
     if 'projects' in data:
-        user.projects = json.dumps(data.get('projects') or [])
+        user.projects = data.get('projects') or []
     if 'training_courses' in data:
-        user.training_courses = json.dumps(data.get('training_courses') or [])
+        user.training_courses = data.get('training_courses') or []
     if 'work_samples' in data:
-        user.work_samples = json.dumps(data.get('work_samples') or [])
+        user.work_samples = data.get('work_samples') or []
 
     db.session.commit()
+    invalidate_principal(user.user_type, user.id)
     return jsonify({'status': 'success'}), 200
 
 
 @app.route('/api/upload-resume', methods=['POST'])
 @jwt_required
-def api_upload_resume():
+def api_upload_resume(user):
     """Accept multipart/form-data resume upload and return JSON with analysis result (JWT-only)."""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
     if 'resume_file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
     file = request.files['resume_file']
     if file.filename == '' or not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file'}), 400
+    if not upload_content_matches(file):
+        return jsonify({'error': 'File content does not match its type'}), 400
 
-    filename = secure_filename(file.filename)
-    full_filename = f"{user.id}_{filename}"
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], full_filename)
-    file.save(filepath)
+    full_filename, filepath = resume_upload_path(user.id, file.filename)
+    if wants_async_response():
+        # Analyze in the background; poll /api/jwt/analysis-status for the result
+        queue_resume_analysis(user.id, file, full_filename, filepath, score_ats=True)
+        return queued_analysis_response()
 
     try:
-        raw_text = extract_text_from_pdf(filepath)
+        raw_text = save_and_extract_upload(file, filepath)
         if not raw_text:
             return jsonify({'error': 'Could not extract text from file'}), 500
         analysis_result = extract_resume_data(raw_text)
@@ -526,17 +1035,16 @@ def api_upload_resume():
         ats_score = ats_result.get('ats_score', 0) if ats_result else 0
         target_job_role = ats_result.get('target_job_role', 'Not specified') if ats_result else 'Not specified'
 
-        resume_analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
-        if not resume_analysis:
-            resume_analysis = ResumeAnalysis(user_id=user.id)
-
-        resume_analysis.raw_text = raw_text
-        resume_analysis.filename = full_filename
-        resume_analysis.extracted_json = json.dumps(analysis_result)
-        resume_analysis.ats_score = ats_score
-        resume_analysis.target_job_role = target_job_role
-        db.session.add(resume_analysis)
-        db.session.commit()
+        projection = resume_projection(analysis_result)
+        save_resume_analysis(user.id, dict(
+            projection,
+            raw_text=raw_text,
+            filename=full_filename,
+            extracted_json=_dumps(analysis_result),
+            ats_score=ats_score,
+            target_job_role=target_job_role,
+            status='completed',
+        ))
 
         return jsonify({
             'status': 'success',
@@ -547,28 +1055,23 @@ def api_upload_resume():
             'ats_recommendations': ats_result.get('recommendations') if ats_result else []
         }), 200
     except Exception as e:
-        print(f"Error analyzing resume (API): {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error analyzing resume (API)")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/jwt/profile', methods=['GET'])
 @jwt_required
-def api_jwt_get_profile():
+def api_jwt_get_profile(user):
     """Return profile for JWT-authenticated user (strict JWT)."""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
     profile = {
         'id': user.id,
         'email': user.email,
         'full_name': user.full_name,
         'career_objective': user.career_objective,
-        'projects': json.loads(user.projects) if user.projects else [],
-        'training_courses': json.loads(user.training_courses) if user.training_courses else [],
+        'projects': user.projects or [],
+        'training_courses': user.training_courses or [],
         'portfolio_url': user.portfolio_url,
-        'work_samples': json.loads(user.work_samples) if user.work_samples else [],
+        'work_samples': user.work_samples or [],
         'accomplishments': user.accomplishments,
         'phone': user.phone,
         'location': user.location,
@@ -580,24 +1083,24 @@ def api_jwt_get_profile():
 
 @app.route('/api/jwt/upload-resume', methods=['POST'])
 @jwt_required
-def api_jwt_upload_resume():
+def api_jwt_upload_resume(user):
     """JWT-only resume upload endpoint accepting multipart/form-data"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
     if 'resume_file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
     file = request.files['resume_file']
     if file.filename == '' or not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file'}), 400
+    if not upload_content_matches(file):
+        return jsonify({'error': 'File content does not match its type'}), 400
 
-    filename = secure_filename(file.filename)
-    full_filename = f"{user.id}_{filename}"
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], full_filename)
-    file.save(filepath)
+    full_filename, filepath = resume_upload_path(user.id, file.filename)
+    if wants_async_response():
+        # Analyze in the background; poll /api/jwt/analysis-status for the result
+        queue_resume_analysis(user.id, file, full_filename, filepath, score_ats=True)
+        return queued_analysis_response()
 
     try:
-        raw_text = extract_text_from_pdf(filepath)
+        raw_text = save_and_extract_upload(file, filepath)
         if not raw_text:
             return jsonify({'error': 'Could not extract text from file'}), 500
         analysis_result = extract_resume_data(raw_text)
@@ -609,140 +1112,88 @@ def api_jwt_upload_resume():
         ats_score = ats_result.get('ats_score', 0) if ats_result else 0
         target_job_role = ats_result.get('target_job_role', 'Not specified') if ats_result else 'Not specified'
 
-        # Calculate profile summary
-        skills = analysis_result.get('skills', [])
-        work_exp = analysis_result.get('work_experience', [])
-        personal = analysis_result.get('personal_details', {})
-        
-        profile_summary = ""
-        if personal:
-            profile_summary += f"{personal.get('name', 'Professional')}\n"
-        if skills:
-            skill_list = skills if isinstance(skills, list) else [skills]
-            profile_summary += f"Skills: {', '.join(skill_list[:8])}\n"
-        if work_exp:
-            exp_count = len(work_exp) if isinstance(work_exp, list) else 1
-            profile_summary += f"Experience: {exp_count} position(s)\n"
-        
-        # Calculate comprehensive resume score (0-100)
-        score = 0
-        education = analysis_result.get('education', [])
-        certifications = analysis_result.get('certifications', [])
-        projects = analysis_result.get('projects', [])
-        
-        # Skills (max 30 points)
-        skill_count = len(skills) if isinstance(skills, list) else (1 if skills else 0)
-        score += min(30, skill_count * 3)
-        
-        # Work Experience (max 25 points)
-        exp_count = len(work_exp) if isinstance(work_exp, list) else (1 if work_exp else 0)
-        score += min(25, exp_count * 8)
-        
-        # Education (max 20 points)
-        edu_count = len(education) if isinstance(education, list) else (1 if education else 0)
-        score += min(20, edu_count * 10)
-        
-        # Certifications (max 15 points)
-        cert_count = len(certifications) if isinstance(certifications, list) else (1 if certifications else 0)
-        score += min(15, cert_count * 5)
-        
-        # Projects (max 10 points)
-        project_count = len(projects) if isinstance(projects, list) else (1 if projects else 0)
-        score += min(10, project_count * 5)
-        
-        analysis_score = min(100, score)
-
-        resume_analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
-        if not resume_analysis:
-            resume_analysis = ResumeAnalysis(user_id=user.id)
-
-        resume_analysis.raw_text = raw_text
-        resume_analysis.filename = full_filename
-        resume_analysis.extracted_json = json.dumps(analysis_result)
-        resume_analysis.ats_score = ats_score
-        resume_analysis.target_job_role = target_job_role
-        resume_analysis.profile_summary_text = profile_summary.strip()
-        resume_analysis.analysis_score = analysis_score
-        db.session.add(resume_analysis)
-        db.session.commit()
+        projection = resume_projection(analysis_result)
+        save_resume_analysis(user.id, dict(
+            projection,
+            raw_text=raw_text,
+            filename=full_filename,
+            extracted_json=_dumps(analysis_result),
+            ats_score=ats_score,
+            target_job_role=target_job_role,
+            status='completed',
+        ))
 
         return jsonify({
             'status': 'success',
             'analysis': analysis_result,
             'ats_score': ats_score,
-            'analysis_score': analysis_score,
+            'analysis_score': projection['analysis_score'],
             'target_job_role': target_job_role,
-            'profile_summary': profile_summary.strip(),
+            'profile_summary': projection['profile_summary_text'],
             'ats_breakdown': ats_result.get('breakdown') if ats_result else None,
             'ats_recommendations': ats_result.get('recommendations') if ats_result else []
         }), 200
     except Exception as e:
-        print(f"Error analyzing resume (JWT API): {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error analyzing resume (JWT API)")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/jwt/generate-career-roadmap', methods=['POST'])
 @jwt_required
-def api_jwt_generate_career_roadmap():
+def api_jwt_generate_career_roadmap(user):
     """JWT-only roadmap generation endpoint. Saves roadmap to DB."""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
     data = request.get_json() or {}
     target_job = data.get('target_job', 'Software Engineer')
 
-    analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
+    analysis = resume_json_row(user.id)
     if not analysis or not analysis.extracted_json:
         return jsonify({'error': 'Please upload a resume first'}), 404
 
     try:
-        extracted_data = json.loads(analysis.extracted_json)
+        extracted_data = resume_data_of(analysis)
         roadmap = get_career_roadmap(extracted_data, target_job)
         if not roadmap:
             return jsonify({'error': 'Failed to generate roadmap'}), 500
 
         # Don't update existing roadmap, create new one to keep history
-        new_rm = CareerRoadmap(user_id=user.id, target_job=target_job, roadmap_json=json.dumps(roadmap))
+        roadmap_json = _dumps(roadmap)
+        new_rm = CareerRoadmap(user_id=user.id, target_job=target_job, roadmap_json=roadmap_json)
         db.session.add(new_rm)
         db.session.commit()
 
-        return jsonify({'status': 'success', 'roadmap': roadmap, 'roadmap_id': new_rm.id}), 200
+        return roadmap_response(roadmap_json, roadmap_id=new_rm.id)
     except Exception as e:
-        print(f"Error generating roadmap (JWT API): {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating roadmap (JWT API)")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/roadmaps', methods=['GET'])
 @jwt_required
-def api_get_roadmaps():
+def api_get_roadmaps(user):
     """Get all roadmaps for the current user"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
+    rows = (
+        select(CareerRoadmap.id, CareerRoadmap.target_job, CareerRoadmap.created_at, CareerRoadmap.roadmap_json)
+        .where(CareerRoadmap.user_id == user.id)
+        .order_by(CareerRoadmap.created_at.desc())
+        .execution_options(yield_per=50)
+    )
     
-    roadmaps = CareerRoadmap.query.filter_by(user_id=user.id).order_by(CareerRoadmap.created_at.desc()).all()
-    roadmaps_list = [{
-        'id': rm.id,
-        'target_job': rm.target_job,
-        'created_at': rm.created_at.isoformat(),
-        'roadmap': json.loads(rm.roadmap_json)
-    } for rm in roadmaps]
+    def generate():
+        # Rows are fetched in batches and each stored roadmap_json is embedded as-is,
+        # so memory stays flat however many roadmaps the user has kept
+        yield '{"status":"success","roadmaps":['
+        for i, rm in enumerate(db.session.execute(rows)):
+            meta = _dumps({'id': rm.id, 'target_job': rm.target_job, 'created_at': rm.created_at.isoformat()})
+            yield (',' if i else '') + meta[:-1] + ',"roadmap":' + rm.roadmap_json + '}'
+        yield ']}'
     
-    return jsonify({'status': 'success', 'roadmaps': roadmaps_list}), 200
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/roadmap/<int:roadmap_id>', methods=['DELETE'])
 @jwt_required
-def api_delete_roadmap(roadmap_id):
+def api_delete_roadmap(user, roadmap_id):
     """Delete a specific roadmap"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
     roadmap = CareerRoadmap.query.filter_by(id=roadmap_id, user_id=user.id).first()
     if not roadmap:
         return jsonify({'error': 'Roadmap not found'}), 404
@@ -754,12 +1205,8 @@ def api_delete_roadmap(roadmap_id):
 
 @app.route('/api/roadmap/<int:roadmap_id>', methods=['GET'])
 @jwt_required
-def api_get_roadmap(roadmap_id):
+def api_get_roadmap(user, roadmap_id):
     """Return a single roadmap by id for current user (JWT-only)"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-
     rm = CareerRoadmap.query.filter_by(id=roadmap_id, user_id=user.id).first()
     if not rm:
         return jsonify({'error': 'Roadmap not found'}), 404
@@ -768,50 +1215,40 @@ def api_get_roadmap(roadmap_id):
         'id': rm.id,
         'target_job': rm.target_job,
         'created_at': rm.created_at.isoformat(),
-        'roadmap': json.loads(rm.roadmap_json)
+        'roadmap': roadmap_data_of(rm)
     }
     return jsonify({'status': 'success', 'roadmap': roadmap}), 200
 
 
 @app.route('/api/profile-enhancement', methods=['POST'])
 @jwt_required
-def api_profile_enhancement():
+def api_profile_enhancement(user):
     """Generate profile enhancement recommendations"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
     analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
     if not analysis or not analysis.extracted_json:
         return jsonify({'error': 'Please upload a resume first'}), 404
     
     try:
-        extracted_data = json.loads(analysis.extracted_json)
+        extracted_data = resume_data_of(analysis)
         enhancement = get_profile_enhancement(extracted_data, analysis.raw_text or '')
         
         if not enhancement:
             return jsonify({'error': 'Failed to generate enhancement recommendations'}), 500
         
         # Save to database
-        analysis.enhancement_recommendations = json.dumps(enhancement)
+        analysis.enhancement_recommendations = _dumps(enhancement)
         db.session.commit()
         
         return jsonify({'status': 'success', 'enhancement': enhancement}), 200
     except Exception as e:
-        print(f"Error generating enhancement: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating enhancement")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/resume-analysis', methods=['GET'])
 @jwt_required
-def api_get_resume_analysis():
+def api_get_resume_analysis(user):
     """Get current resume analysis including ATS score"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
     analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
     if not analysis:
         return jsonify({'status': 'success', 'analysis': None}), 200
@@ -822,33 +1259,42 @@ def api_get_resume_analysis():
             'filename': analysis.filename,
             'ats_score': analysis.ats_score,
             'target_job_role': analysis.target_job_role,
-            'extracted_data': json.loads(analysis.extracted_json) if analysis.extracted_json else None,
-            'enhancement_recommendations': json.loads(analysis.enhancement_recommendations) if analysis.enhancement_recommendations else None,
+            'extracted_data': resume_data_of(analysis) if analysis.extracted_json else None,
+            'enhancement_recommendations': _loads(analysis.enhancement_recommendations) if analysis.enhancement_recommendations else None,
             'created_at': analysis.created_at.isoformat(),
             'updated_at': analysis.updated_at.isoformat()
         }
     }), 200
 
 
-def _get_request_user():
-    """Helper: prefer JWT user (g.jwt_user) else Flask-Login current_user if authenticated."""
-    try:
-        if hasattr(g, 'jwt_user') and g.jwt_user:
-            return g.jwt_user
-    except:
-        pass
-    try:
-        if current_user and current_user.is_authenticated:
-            return current_user
-    except:
-        pass
-    return None
+# Seconds browsers and shared caches may reuse /api/jobs before revalidating
+JOBS_LIST_MAX_AGE = 30
 
 
 @app.route('/api/jobs', methods=['GET'])
 def api_get_jobs():
     """Return list of active jobs as JSON. No auth required to view jobs."""
-    jobs = Job.query.filter_by(is_active=True).all()
+    # Validator for the public list: changes whenever an active job is added, edited,
+    # deactivated or deleted, and costs one aggregate instead of the full list
+    count, latest = db.session.query(func.count(Job.id), func.max(Job.updated_at)).filter(Job.is_active == True).one()
+    etag = hashlib.blake2b(f'{count}:{latest}'.encode(), digest_size=8).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = _jobs_list_response()
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = JOBS_LIST_MAX_AGE
+    return response
+
+
+def _jobs_list_response():
+    # Only the listed columns: the description/requirements TEXT columns stay in the
+    # database, and the company name comes back in the same SELECT
+    jobs = Job.query.options(
+        load_only(Job.id, Job.title, Job.location, Job.salary_range, Job.job_type),
+        joinedload(Job.company).load_only(Company.company_name)
+    ).filter_by(is_active=True).all()
     jobs_list = []
     for j in jobs:
         jobs_list.append({
@@ -859,47 +1305,39 @@ def api_get_jobs():
             'job_type': j.job_type,
             'company': j.company.company_name
         })
-    return jsonify({'status': 'success', 'jobs': jobs_list}), 200
+    return jsonify({'status': 'success', 'jobs': jobs_list})
 
 
 @app.route('/api/matches', methods=['GET'])
 @jwt_required
-def api_get_matches():
+def api_get_matches(user):
     """Return current user's matches (JWT-only)"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-
-    matches = Match.query.filter_by(user_id=user.id).all()
+    # Jobs and their companies come back in the same SELECT instead of two lazy loads per match
+    matches = Match.query.options(
+        joinedload(Match.job).joinedload(Job.company)
+    ).filter_by(user_id=user.id).all()
     out = []
-    # Get user's resume data for AI-enhanced matching
-    resume_analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
-    resume_data = {}
-    if resume_analysis and resume_analysis.extracted_json:
+    # Prefer stored match_score; score any missing ones in one TF-IDF pass and persist them
+    unscored = [m for m in matches if m.match_score is None]
+    resume_analysis = resume_json_row(user.id) if unscored else None
+    if not (resume_analysis and resume_analysis.extracted_json):
+        unscored = []
+    if unscored:
         try:
-            resume_data = json.loads(resume_analysis.extracted_json)
-        except Exception:
-            resume_data = {}
+            # The resume side is flattened once per resume version, not on every call
+            scores = calculate_match_scores(
+                resume_features_of(resume_analysis),
+                [(m.job.description_text or '', m.job.requirements or '') for m in unscored]
+            )
+            for m, score in zip(unscored, scores):
+                m.match_score = int(score)
+        except Exception as e:
+            logger.warning("Error calculating match score: %s", e)
+            unscored = []
 
     for m in matches:
         job = m.job
-        # Calculate AI-enhanced match score using TF-IDF and cosine similarity
-        # Prefer stored match_score; if missing, compute and persist it for future use
         match_score = m.match_score
-        if match_score is None and resume_data:
-            try:
-                match_score = calculate_match_score(
-                    resume_data=resume_data,
-                    job_description=job.description_text or '',
-                    job_requirements=job.requirements or ''
-                )
-                # Persist the computed score on the match
-                m.match_score = int(match_score) if match_score is not None else None
-                db.session.add(m)
-                db.session.commit()
-            except Exception as e:
-                print(f"Error calculating match score: {e}")
-                match_score = None
 
         out.append({
             'id': m.id,
@@ -917,37 +1355,219 @@ def api_get_matches():
             'application_status': m.application_status,
             'is_hidden_by_user': m.is_hidden_by_user
         })
+    if unscored:
+        _commit_backfilled_scores("Error saving backfilled match scores")
     return jsonify({'status': 'success', 'matches': out}), 200
 
 
 @app.route('/api/match', methods=['POST'])
 @jwt_required
-def api_post_match():
+def api_post_match(user):
     """Create or update a match for current user. JSON: { job_id: int, is_match: true/false } (JWT-only)"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
     data = request.get_json() or {}
     job_id = data.get('job_id')
     is_match_flag = data.get('is_match', True)
     if not job_id:
         return jsonify({'error': 'Missing job_id'}), 400
 
-    # Ensure job exists
-    job = Job.query.get(job_id)
-    if not job:
+    # Ensure job exists (its company is needed for the applicant counter)
+    company_id = db.session.query(Job.company_id).filter_by(id=job_id).scalar()
+    if company_id is None:
         return jsonify({'error': 'Job not found'}), 404
 
-    match = Match.query.filter_by(user_id=user.id, job_id=job_id).first()
-    if not match:
-        match = Match(user_id=user.id, job_id=job_id, is_match=bool(is_match_flag))
-        db.session.add(match)
+    # No ORM round-trip: flip an existing swipe, else insert one. Each statement is
+    # atomic, so concurrent posts can't double-insert or lose the company's count.
+    is_match = bool(is_match_flag)
+    match_id = db.session.execute(
+        update(Match)
+        .where(Match.user_id == user.id, Match.job_id == job_id, Match.is_match != is_match)
+        .values(is_match=is_match)
+        .returning(Match.id)
+    ).scalar()
+    if match_id is not None:
+        _bump_company_counts(company_id, applicants=1 if is_match else -1)
     else:
-        match.is_match = bool(is_match_flag)
+        match_id = db.session.execute(
+            insert_ignore_conflicts(Match)
+            .values(user_id=user.id, job_id=job_id, is_match=is_match)
+            .returning(Match.id)
+        ).scalar()
+        if match_id is not None and is_match:
+            _bump_company_counts(company_id, applicants=1)
+        elif match_id is None:
+            # Already swiped this way; nothing to change
+            match_id = db.session.query(Match.id).filter_by(user_id=user.id, job_id=job_id).scalar()
     db.session.commit()
-    return jsonify({'status': 'success', 'match_id': match.id}), 200
+    return jsonify({'status': 'success', 'match_id': match_id}), 200
+
 
 
+# --- BACKGROUND RESUME ANALYSIS ---
+# Text extraction and the Gemini call take several seconds, so uploads from the
+# profile page are analyzed on a small worker pool instead of the request thread.
+# Under gevent (see wsgi.py) the pool must use native threads: patched threads are
+# greenlets and CPU-bound PDF parsing on them would stall every other connection.
+if SOCKETIO_ASYNC_MODE == 'gevent':
+    from gevent.threadpool import ThreadPoolExecutor as _AnalysisExecutor
+else:
+    _AnalysisExecutor = ThreadPoolExecutor
+resume_executor = _AnalysisExecutor(max_workers=int(os.environ.get('RESUME_ANALYSIS_WORKERS', 2)))
+# Swipe scoring takes milliseconds; a pool of its own keeps it from queueing behind
+# multi-second analyses, and a burst of swipes from delaying them
+match_score_executor = _AnalysisExecutor(max_workers=int(os.environ.get('MATCH_SCORE_WORKERS', 2)))
+
+
+def run_off_hub(fn, *args):
+    """Call a CPU-bound function without blocking the gevent hub.
+
+    Runs on gevent's native thread pool when serving under gevent, inline otherwise.
+    """
+    if SOCKETIO_ASYNC_MODE == 'gevent':
+        import gevent
+        return gevent.get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+
+def analyze_resume_task(user_id, filepath, score_ats=False):
+    """Extract, analyze and score an uploaded resume, then store the result."""
+    with app.app_context():
+        resume_analysis = ResumeAnalysis.query.filter_by(user_id=user_id).first()
+        if not resume_analysis:
+            return
+        
+        try:
+            # Extract text from the PDF
+            raw_text = extract_text_from_pdf(filepath)
+            if not raw_text:
+                resume_analysis.status = 'failed'
+                db.session.commit()
+                return
+            
+            # Analyze the resume (extract structured data)
+            analysis_result = extract_resume_data(raw_text)
+            if not analysis_result:
+                resume_analysis.status = 'failed'
+                db.session.commit()
+                return
+            
+            # Update analysis data
+            resume_analysis.raw_text = raw_text
+            resume_analysis.extracted_json = _dumps(analysis_result)
+            
+            if score_ats:
+                ats_result = calculate_ats_score(analysis_result)
+                resume_analysis.ats_score = ats_result.get('ats_score', 0) if ats_result else 0
+                resume_analysis.target_job_role = ats_result.get('target_job_role', 'Not specified') if ats_result else 'Not specified'
+            
+            # Precompute the summary, score and counts the list pages render
+            store_resume_projection(resume_analysis, analysis_result)
+            resume_analysis.status = 'completed'
+            db.session.commit()
+        except Exception as e:
+            logger.exception("Error analyzing resume for user %s", user_id)
+            db.session.rollback()
+            resume_analysis.status = 'failed'
+            db.session.commit()
+
+
+def queue_resume_analysis(user_id, file, full_filename, filepath, score_ats=False):
+    """Save an upload, mark its analysis as processing and hand it to the worker pool"""
+    file.save(filepath)
+    resume_analysis = ResumeAnalysis.query.filter_by(user_id=user_id).first()
+    if not resume_analysis:
+        resume_analysis = ResumeAnalysis(user_id=user_id)
+    resume_analysis.filename = full_filename  # Store full filename with user_id prefix
+    resume_analysis.status = 'processing'
+    resume_analysis.score_ats = score_ats  # Kept so requeue-analyses repeats the same work
+    db.session.add(resume_analysis)
+    db.session.commit()
+    
+    resume_executor.submit(analyze_resume_task, user_id, str(filepath), score_ats)
+
+
+# Uploads up to this size are parsed from memory; larger ones are spooled to disk first
+IN_MEMORY_UPLOAD_LIMIT = 8 * 1024 * 1024
+
+
+def save_and_extract_upload(file, filepath):
+    """Extract text from an uploaded resume and keep the file at filepath.
+
+    Returns None (and keeps nothing on disk) when no text can be extracted. Small
+    uploads are parsed straight from memory and written once; large ones are
+    streamed to disk and parsed from there so they are never held in RAM whole.
+    """
+    if (request.content_length or 0) <= IN_MEMORY_UPLOAD_LIMIT:
+        data = file.stream.read()
+        raw_text = run_off_hub(extract_text_from_bytes, data, filepath.suffix.lstrip('.').lower() or 'pdf')
+        if raw_text:
+            filepath.write_bytes(data)
+        return raw_text
+
+    file.save(filepath)
+    raw_text = run_off_hub(extract_text_from_pdf, str(filepath))
+    if not raw_text:
+        filepath.unlink(missing_ok=True)
+    return raw_text
+
+
+def wants_async_response():
+    """True if the client sent `Prefer: respond-async` (RFC 7240)"""
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def queued_analysis_response():
+    return jsonify({'status': 'queued', 'analysis_status': 'processing'}), 202
+
+
+# --- PROFILE FORM HELPERS ---
+# Dynamic profile rows are posted as <kind>_<field>_<index>, e.g. project_title_0
+_PROFILE_ITEM_FIELD_RE = re.compile(r'^(project|course|sample)_(title|desc|link|name|issuer|date)_(\d+)$')
+_PROFILE_ITEM_FIELDS = {
+    'project': (('title', 'title'), ('description', 'desc'), ('link', 'link')),
+    'course': (('name', 'name'), ('issuer', 'issuer'), ('date', 'date')),
+    'sample': (('title', 'title'), ('link', 'link')),
+}
+
+
+def _collect_profile_items(form):
+    """Group the dynamic project/course/sample fields of the profile form in one pass"""
+    buckets = {kind: {} for kind in _PROFILE_ITEM_FIELDS}
+    for key, value in form.items():
+        m = _PROFILE_ITEM_FIELD_RE.match(key)
+        if m:
+            kind, field, index = m.groups()
+            buckets[kind].setdefault(int(index), {})[field] = value
+    
+    items = {}
+    for kind, fields in _PROFILE_ITEM_FIELDS.items():
+        rows = [
+            {name: row.get(field, '') for name, field in fields}
+            for _, row in sorted(buckets[kind].items())
+        ]
+        # Rows without a title/name are blank entries the user never filled in
+        items[kind] = [row for row in rows if row[fields[0][0]]]
+    return items
+
+
+# --- PAGINATION ---
+MATCHES_PAGE_SIZE = 50
+
+
+def _match_page(query):
+    """Return one page of matches (newest first) and the cursor for the next page.
+
+    Keyset pagination on Match.id: the ?cursor= value is the last id shown, so each
+    page is an index range scan instead of loading the whole result set.
+    """
+    cursor = request.args.get('cursor', type=int)
+    if cursor:
+        query = query.filter(Match.id < cursor)
+    rows = query.order_by(Match.id.desc()).limit(MATCHES_PAGE_SIZE + 1).all()
+    if len(rows) > MATCHES_PAGE_SIZE:
+        rows = rows[:MATCHES_PAGE_SIZE]
+        return rows, rows[-1].id
+    return rows, None
+
 
 # --- JOB SEEKER ROUTES ---
 
@@ -966,94 +1586,10 @@ def profile():
         # Handle resume file upload
         if 'resume_file' in request.files:
             file = request.files['resume_file']
-            if file and file.filename != '' and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                full_filename = f"{current_user.id}_{filename}"
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], full_filename)
-                file.save(filepath)
-                
-                try:
-                    # Extract text from the PDF
-                    raw_text = extract_text_from_pdf(filepath)
-                    
-                    if not raw_text:
-                        flash('Could not extract text from the PDF. Please try a different file.', 'error')
-                        return redirect(url_for('profile'))
-                    
-                    # Analyze the resume (extract structured data)
-                    analysis_result = extract_resume_data(raw_text)
-                    
-                    if not analysis_result:
-                        flash('Could not analyze the resume. Please ensure your GOOGLE_API_KEY is set in .env', 'error')
-                        return redirect(url_for('profile'))
-                    
-                    # Get improvement suggestions (optional - requires job profile)
-                    # For now, we'll skip this and just store the extracted data
-                    # suggestions = get_resume_feedback(analysis_result, "Software Engineer")
-                    
-                    # Get or create resume analysis record
-                    resume_analysis = ResumeAnalysis.query.filter_by(user_id=current_user.id).first()
-                    if not resume_analysis:
-                        resume_analysis = ResumeAnalysis(user_id=current_user.id)
-                    
-                    # Update analysis data
-                    resume_analysis.raw_text = raw_text
-                    resume_analysis.filename = full_filename  # Store full filename with user_id prefix
-                    resume_analysis.extracted_json = json.dumps(analysis_result)
-                    
-                    # Auto-generate profile summary from extracted data
-                    skills = analysis_result.get('skills', [])
-                    work_exp = analysis_result.get('work_experience', [])
-                    personal = analysis_result.get('personal_details', {})
-                    
-                    profile_summary = ""
-                    if personal:
-                        profile_summary += f"{personal.get('name', 'Professional')}\n"
-                    if skills:
-                        skill_list = skills if isinstance(skills, list) else [skills]
-                        profile_summary += f"Skills: {', '.join(skill_list[:8])}\n"
-                    if work_exp:
-                        exp_count = len(work_exp) if isinstance(work_exp, list) else 1
-                        profile_summary += f"Experience: {exp_count} position(s)\n"
-                    
-                    resume_analysis.profile_summary_text = profile_summary.strip()
-                    
-                    # Calculate a comprehensive resume score (0-100)
-                    score = 0
-                    
-                    # Extract all relevant data from analysis_result
-                    education = analysis_result.get('education', [])
-                    certifications = analysis_result.get('certifications', [])
-                    projects = analysis_result.get('projects', [])
-                    
-                    # Skills (max 30 points)
-                    skill_count = len(skills) if isinstance(skills, list) else (1 if skills else 0)
-                    score += min(30, skill_count * 3)  # 3 points per skill, max 10 skills
-                    
-                    # Work Experience (max 25 points)
-                    exp_count = len(work_exp) if isinstance(work_exp, list) else (1 if work_exp else 0)
-                    score += min(25, exp_count * 8)  # 8 points per experience, max ~3 experiences
-                    
-                    # Education (max 20 points)
-                    edu_count = len(education) if isinstance(education, list) else (1 if education else 0)
-                    score += min(20, edu_count * 10)  # 10 points per education, max 2 degrees
-                    
-                    # Certifications (max 15 points)
-                    cert_count = len(certifications) if isinstance(certifications, list) else (1 if certifications else 0)
-                    score += min(15, cert_count * 5)  # 5 points per cert, max 3 certs
-                    
-                    # Projects (max 10 points)
-                    project_count = len(projects) if isinstance(projects, list) else (1 if projects else 0)
-                    score += min(10, project_count * 5)  # 5 points per project, max 2 projects
-                    
-                    resume_analysis.analysis_score = min(100, score)
-                    
-                    db.session.add(resume_analysis)
-                    db.session.commit()
-                    
-                    flash('Resume uploaded and analyzed successfully!', 'success')
-                except Exception as e:
-                    flash(f'Error analyzing resume: {str(e)}', 'danger')
+            if file and file.filename != '' and allowed_file(file.filename) and upload_content_matches(file):
+                full_filename, filepath = resume_upload_path(current_user.id, file.filename)
+                queue_resume_analysis(current_user.id, file, full_filename, filepath)
+                flash('Resume uploaded! Analysis is running and will appear here shortly.', 'success')
             else:
                 flash('Invalid file format. Please upload a PDF, DOC, DOCX, or TXT file.', 'warning')
         
@@ -1078,45 +1614,14 @@ def profile():
             current_user.linkedin_url = request.form.get('linkedin_url', '')
             current_user.github_url = request.form.get('github_url', '')
             
-            # Handle projects (JSON)
-            projects_data = []
-            project_count = int(request.form.get('project_count', 0))
-            for i in range(project_count):
-                project = {
-                    'title': request.form.get(f'project_title_{i}', ''),
-                    'description': request.form.get(f'project_desc_{i}', ''),
-                    'link': request.form.get(f'project_link_{i}', '')
-                }
-                if project['title']:
-                    projects_data.append(project)
-            current_user.projects = json.dumps(projects_data) if projects_data else None
-            
-            # Handle training/courses (JSON)
-            courses_data = []
-            course_count = int(request.form.get('course_count', 0))
-            for i in range(course_count):
-                course = {
-                    'name': request.form.get(f'course_name_{i}', ''),
-                    'issuer': request.form.get(f'course_issuer_{i}', ''),
-                    'date': request.form.get(f'course_date_{i}', '')
-                }
-                if course['name']:
-                    courses_data.append(course)
-            current_user.training_courses = json.dumps(courses_data) if courses_data else None
-            
-            # Handle work samples (JSON)
-            samples_data = []
-            sample_count = int(request.form.get('sample_count', 0))
-            for i in range(sample_count):
-                sample = {
-                    'title': request.form.get(f'sample_title_{i}', ''),
-                    'link': request.form.get(f'sample_link_{i}', '')
-                }
-                if sample['title'] and sample['link']:
-                    samples_data.append(sample)
-            current_user.work_samples = json.dumps(samples_data) if samples_data else None
+            # Handle projects, training/courses and work samples (JSON)
+            items = _collect_profile_items(request.form)
+            current_user.projects = items['project'] or None
+            current_user.training_courses = items['course'] or None
+            current_user.work_samples = items['sample'] or None
             
             db.session.commit()
+            invalidate_principal(current_user.user_type, current_user.id)
             flash('Profile updated successfully!', 'success')
         
         return redirect(url_for('profile'))
@@ -1126,70 +1631,110 @@ def profile():
     return render_template('profile.html', analysis=analysis)
 
 
+@app.route('/api/analysis-status', methods=['GET'])
+@jobseeker_required
+def api_analysis_status():
+    """Report the state of the current user's background resume analysis"""
+    analysis = ResumeAnalysis.query.filter_by(user_id=current_user.id).first()
+    return jsonify({
+        'status': 'success',
+        'analysis_status': analysis.status if analysis else None
+    }), 200
+
+
+@app.route('/api/jwt/analysis-status', methods=['GET'])
+@jwt_required
+def api_jwt_analysis_status(user):
+    """JWT twin of /api/analysis-status, including scores once the analysis completes"""
+    if user.user_type != 'jobseeker':
+        return jsonify({'error': 'Unauthorized'}), 401
+    analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
+    payload = {'status': 'success', 'analysis_status': analysis.status if analysis else None}
+    if analysis and analysis.status == 'completed':
+        payload.update({
+            'ats_score': analysis.ats_score,
+            'analysis_score': analysis.analysis_score,
+            'target_job_role': analysis.target_job_role,
+        })
+    return jsonify(payload), 200
+
+
+def send_resume_file(filename):
+    """Serve an uploaded resume, letting nginx stream it when it sits in front of the app"""
+    prefix = app.config.get('UPLOAD_ACCEL_PREFIX')
+    if not prefix:
+        return send_from_directory(UPLOAD_DIR, filename, as_attachment=True, conditional=True)
+    
+    if safe_join(str(UPLOAD_DIR), filename) is None:
+        abort(404)
+    response = Response(mimetype='application/octet-stream')
+    response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(filename)
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    return response
+
+
+def _owns_resume(user_id, filename):
+    """True if filename is the user's current resume (EXISTS check, no row loaded)"""
+    return db.session.query(
+        exists().where(ResumeAnalysis.user_id == user_id, ResumeAnalysis.filename == filename)
+    ).scalar()
+
+
+def _liked_company_job(user_id, company_id):
+    """True if the user liked any of the company's jobs (EXISTS check, no row loaded)"""
+    return db.session.query(
+        exists().where(
+            Match.user_id == user_id,
+            Match.job_id.in_(_company_job_ids(company_id)),
+            Match.is_match == True
+        )
+    ).scalar()
+
+
 @app.route('/download-resume/<filename>')
 @login_required
 def download_resume(filename):
     """Download a resume file"""
+    # Names are {user_id}_{original_filename}; anything else was never uploaded here
+    user_id = resume_owner_id(filename)
+    if user_id is None:
+        abort(404)
+    
     # Security: Only allow downloading your own resume or if you're a company viewing a candidate
     if current_user.user_type == 'jobseeker':
         # Job seekers can only download their own resume
-        analysis = ResumeAnalysis.query.filter_by(user_id=current_user.id).first()
-        if not analysis or analysis.filename != filename:
+        if not _owns_resume(current_user.id, filename):
             abort(403)
     elif current_user.user_type == 'company':
         # Companies can download resumes of candidates who applied to their jobs
-        # Extract user_id from filename (format: {user_id}_{original_filename})
-        try:
-            user_id = int(filename.split('_')[0])
-            # Check if this user applied to any of the company's jobs
-            job_ids = [job.id for job in current_user.jobs]
-            match = Match.query.filter(
-                Match.user_id == user_id,
-                Match.job_id.in_(job_ids),
-                Match.is_match == True
-            ).first()
-            if not match:
-                abort(403)
-        except (ValueError, IndexError):
-            abort(404)
+        if not _liked_company_job(user_id, current_user.id):
+            abort(403)
     
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
+    return send_resume_file(filename)
 
 
 @app.route('/api/download-resume/<filename>', methods=['GET'])
 @jwt_required
-def api_download_resume(filename):
+def api_download_resume(user, filename):
     """Download a resume file (JWT auth version)"""
-    user = _get_request_user()
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
+    # Names are {user_id}_{original_filename}; anything else was never uploaded here
+    owner_id = resume_owner_id(filename)
+    if owner_id is None:
+        return jsonify({'error': 'Invalid filename'}), 404
     
     # Security: Only allow downloading your own resume or if you're a company viewing a candidate
     if user.user_type == 'jobseeker':
         # Job seekers can only download their own resume
-        analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
-        if not analysis or analysis.filename != filename:
+        if not _owns_resume(user.id, filename):
             return jsonify({'error': 'Forbidden'}), 403
     elif user.user_type == 'company':
         # Companies can download resumes of candidates who applied to their jobs
-        # Extract user_id from filename (format: {user_id}_{original_filename})
-        try:
-            user_id = int(filename.split('_')[0])
-            # Check if this user applied to any of the company's jobs
-            job_ids = [job.id for job in user.jobs]
-            match = Match.query.filter(
-                Match.user_id == user_id,
-                Match.job_id.in_(job_ids),
-                Match.is_match == True
-            ).first()
-            if not match:
-                return jsonify({'error': 'Forbidden - candidate not found'}), 403
-        except (ValueError, IndexError):
-            return jsonify({'error': 'Invalid filename'}), 404
+        if not _liked_company_job(owner_id, user.id):
+            return jsonify({'error': 'Forbidden - candidate not found'}), 403
     else:
         return jsonify({'error': 'Forbidden'}), 403
     
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
+    return send_resume_file(filename)
 
 
 @app.route('/matches')
@@ -1204,72 +1749,106 @@ def matches():
         matches_query = Match.query.filter_by(
             user_id=current_user.id, 
             is_match=False
-        ).all()
-        
-        jobs_list = []
-        for match in matches_query:
-            jobs_list.append({
-                'match': match,
-                'job': match.job,
-                'status': match.application_status
-            })
-        
+        )
     elif filter_type == 'hidden':
         # Show hidden jobs
         matches_query = Match.query.filter_by(
             user_id=current_user.id,
             is_match=True,
             is_hidden_by_user=True
-        ).all()
-        
-        jobs_list = []
-        for match in matches_query:
-            jobs_list.append({
-                'match': match,
-                'job': match.job,
-                'status': match.application_status
-            })
-            
+        )
     else:  # filter_type == 'all' or anything else
         # Show liked jobs (not hidden) - default
         matches_query = Match.query.filter_by(
             user_id=current_user.id, 
             is_match=True,
             is_hidden_by_user=False
-        ).all()
-        
-        jobs_list = []
-        for match in matches_query:
-            jobs_list.append({
-                'match': match,
-                'job': match.job,
-                'status': match.application_status
-            })
+        )
+    
+    page, next_cursor = _match_page(matches_query.options(joinedload(Match.job)))
     
-    return render_template('matches.html', matches_with_jobs=jobs_list, current_filter=filter_type)
+    jobs_list = []
+    for match in page:
+        jobs_list.append({
+            'match': match,
+            'job': match.job,
+            'status': match.application_status
+        })
+    
+    return render_template('matches.html', matches_with_jobs=jobs_list, current_filter=filter_type, next_cursor=next_cursor)
 
 
 
 # --- COMPANY ROUTES ---
 
+def _company_job_ids(company_id):
+    """Subquery of a company's job IDs, for Match.job_id.in_() semi-joins in the database"""
+    return select(Job.id).where(Job.company_id == company_id).scalar_subquery()
+
+
+def _company_stats(company_id):
+    """Return (total_jobs, total_applicants) for a company from its denormalized counters"""
+    stats = db.session.query(
+        Company.total_jobs_count, Company.total_applicants_count
+    ).filter(Company.id == company_id).one()
+    return stats[0], stats[1]
+
+
+def _job_company_id(job_id):
+    """Scalar subquery for the company that owns a job, so counters can be bumped by job id"""
+    return select(Job.company_id).where(Job.id == job_id).scalar_subquery()
+
+
+def _bump_company_counts(company_id, jobs=0, applicants=0):
+    """Adjust a company's dashboard counters in the current transaction.
+
+    company_id may be an id or _job_company_id(). Applicants are likes on the company's
+    jobs, whatever their application status. Callers commit.
+    """
+    db.session.execute(
+        update(Company)
+        .where(Company.id == company_id)
+        .values(
+            total_jobs_count=Company.total_jobs_count + jobs,
+            total_applicants_count=Company.total_applicants_count + applicants,
+        )
+    )
+
+
+def recount_company_counters(company_id=None):
+    """Recompute the dashboard counters from jobs and matches (one company, or all).
+
+    For writes that don't go through _bump_company_counts (seeding, deletes with
+    cascades) and to repair drift. Callers commit.
+    """
+    jobs = (select(func.count(Job.id))
+            .where(Job.company_id == Company.id)
+            .correlate(Company).scalar_subquery())
+    applicants = (select(func.count(Match.id))
+                  .join(Job, Job.id == Match.job_id)
+                  .where(Job.company_id == Company.id, Match.is_match == True)
+                  .correlate(Company).scalar_subquery())
+    stmt = update(Company).values(total_jobs_count=jobs, total_applicants_count=applicants)
+    if company_id is not None:
+        stmt = stmt.where(Company.id == company_id)
+    db.session.execute(stmt)
+
+
 @app.route('/company/dashboard')
 @company_required
 def company_dashboard():
     """Company dashboard with stats"""
-    total_jobs = Job.query.filter_by(company_id=current_user.id).count()
-    
-    # Count total applicants (users who liked any of this company's jobs)
-    job_ids = [job.id for job in current_user.jobs]
-    total_applicants = Match.query.filter(
-        Match.job_id.in_(job_ids),
+    # Count jobs and total applicants (likes on any of this company's jobs) together
+    total_jobs, total_applicants = _company_stats(current_user.id)
+    
+    # Get recent matches (with the user and job the template renders)
+    recent_matches = Match.query.options(
+        joinedload(Match.user),
+        joinedload(Match.job)
+    ).filter(
+        Match.job_id.in_(_company_job_ids(current_user.id)),
         Match.is_match == True
-    ).count() if job_ids else 0
-    
-    # Get recent matches
-    recent_matches = Match.query.filter(
-        Match.job_id.in_(job_ids),
-        Match.is_match == True
-    ).order_by(Match.created_at.desc()).limit(5).all() if job_ids else []
+    ).order_by(Match.created_at.desc()).limit(5).all()
     
     return render_template('company/dashboard.html',
                          total_jobs=total_jobs,
@@ -1302,6 +1881,7 @@ def post_job():
         )
         
         db.session.add(new_job)
+        _bump_company_counts(current_user.id, jobs=1)
         db.session.commit()
         
         flash(f'Job "{title}" posted successfully!', 'success')
@@ -1314,32 +1894,39 @@ def post_job():
 @company_required
 def my_jobs():
     """List all jobs posted by this company"""
-    jobs = Job.query.filter_by(company_id=current_user.id).order_by(Job.created_at.desc()).all()
-    return render_template('company/my_jobs.html', jobs=jobs)
+    jobs = current_user.jobs.order_by(Job.created_at.desc()).all()
+    
+    # Applicant count per job in one grouped query instead of loading every match
+    applicant_counts = dict(
+        db.session.query(Match.job_id, func.count(Match.id))
+        .filter(Match.job_id.in_([job.id for job in jobs]), Match.is_match == True)
+        .group_by(Match.job_id)
+        .all()
+    ) if jobs else {}
+    return render_template('company/my_jobs.html', jobs=jobs, applicant_counts=applicant_counts)
 
 
 @app.route('/company/applicants')
 @company_required
 def applicants():
     """Show all users who liked this company's jobs (exclude rejected)"""
-    # Get all job IDs for this company
-    job_ids = [job.id for job in current_user.jobs]
-    
-    # Get all matches (likes) for these jobs, excluding rejected applicants
-    if job_ids:
-        matches = Match.query.filter(
-            Match.job_id.in_(job_ids),
-            Match.is_match == True,
-            Match.application_status != 'rejected'  # NEW: Exclude rejected applicants
-        ).order_by(Match.created_at.desc()).all()
-    else:
-        matches = []
+    # Get all matches (likes) for this company's jobs, excluding rejected applicants
+    # Load applicant, resume and job with the matches in a single SELECT
+    matches = Match.query.options(
+        joinedload(Match.user).joinedload(User.resume),
+        joinedload(Match.job)
+    ).filter(
+        Match.job_id.in_(_company_job_ids(current_user.id)),
+        Match.is_match == True,
+        Match.application_status != 'rejected'  # NEW: Exclude rejected applicants
+    )
+    matches, next_cursor = _match_page(matches)
     
     # Organize by user with their profile
     applicants_data = []
     for match in matches:
         user = match.user
-        resume = ResumeAnalysis.query.filter_by(user_id=user.id).first()
+        resume = user.resume
         applicants_data.append({
             'match': match,  # NEW: Include match object for status
             'user': user,
@@ -1349,21 +1936,20 @@ def applicants():
             'status': match.application_status  # NEW: Include status
         })
     
-    return render_template('company/applicants.html', applicants=applicants_data)
+    return render_template('company/applicants.html', applicants=applicants_data, next_cursor=next_cursor)
 
 
 @app.route('/company/candidate/<int:user_id>')
 @company_required
 def candidate_profile(user_id):
     """View full profile of a candidate"""
-    user = User.query.get_or_404(user_id)
-    analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
+    user = User.query.options(joinedload(User.resume)).get_or_404(user_id)
+    analysis = user.resume
     
     # Get the match/application for context
-    job_ids = [job.id for job in current_user.jobs]
     match = Match.query.filter(
         Match.user_id == user_id,
-        Match.job_id.in_(job_ids),
+        Match.job_id.in_(_company_job_ids(current_user.id)),
         Match.is_match == True
     ).first()
     
@@ -1378,23 +1964,17 @@ def candidate_profile(user_id):
 
 @app.route('/api/company/dashboard', methods=['GET'])
 @jwt_required
-def api_company_dashboard():
+def api_company_dashboard(user):
     """Return simple dashboard stats for the authenticated company."""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
-    total_jobs = Job.query.filter_by(company_id=user.id).count()
-    job_ids = [job.id for job in user.jobs]
-    total_applicants = Match.query.filter(
-        Match.job_id.in_(job_ids),
-        Match.is_match == True
-    ).count() if job_ids else 0
+    total_jobs, total_applicants = _company_stats(user.id)
 
-    recent_matches = Match.query.filter(
-        Match.job_id.in_(job_ids),
+    recent_matches = Match.query.options(joinedload(Match.job)).filter(
+        Match.job_id.in_(_company_job_ids(user.id)),
         Match.is_match == True
-    ).order_by(Match.created_at.desc()).limit(5).all() if job_ids else []
+    ).order_by(Match.created_at.desc()).limit(5).all()
 
     recent = []
     for m in recent_matches:
@@ -1411,44 +1991,69 @@ def api_company_dashboard():
 
 @app.route('/api/company/post-job', methods=['POST'])
 @jwt_required
-def api_company_post_job():
+def api_company_post_job(user):
     """Create a new job via JSON payload. Quick and dirty."""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
-    data = request.get_json() or {}
-    title = data.get('title')
-    location = data.get('location')
-    description = data.get('description')
-    requirements = data.get('requirements', '')
-    salary_range = data.get('salary_range', '')
-    job_type = data.get('job_type', 'Full-time')
-    apply_url = data.get('apply_url', '')
-
-    if not title or not description:
+    values = _job_values(user.id, request.get_json() or {})
+    if values is None:
         return jsonify({'error': 'Missing title or description'}), 400
 
-    new_job = Job(
-        company_id=user.id,
-        title=title,
-        location=location,
-        description_text=description,
-        requirements=requirements,
-        salary_range=salary_range,
-        job_type=job_type,
-        apply_url=apply_url
-    )
+    new_job = Job(**values)
     db.session.add(new_job)
+    _bump_company_counts(user.id, jobs=1)
     db.session.commit()
     return jsonify({'status': 'success', 'job_id': new_job.id}), 201
 
 
+@app.route('/api/company/post-jobs', methods=['POST'])
+@jwt_required
+def api_company_post_jobs(user):
+    """Create several jobs at once. JSON: { jobs: [ {title, description, ...}, ... ] }"""
+    if user.user_type != 'company':
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    jobs = (request.get_json() or {}).get('jobs')
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({'error': 'Missing jobs list'}), 400
+
+    rows = []
+    for index, job in enumerate(jobs):
+        values = _job_values(user.id, job) if isinstance(job, dict) else None
+        if values is None:
+            return jsonify({'error': f'Missing title or description in job {index}'}), 400
+        rows.append(values)
+
+    # One executemany INSERT ... RETURNING instead of a unit-of-work flush per Job object
+    job_ids = db.session.scalars(insert(Job).returning(Job.id), rows).all()
+    _bump_company_counts(user.id, jobs=len(job_ids))
+    db.session.commit()
+    return jsonify({'status': 'success', 'created': len(job_ids), 'job_ids': job_ids}), 201
+
+
+def _job_values(company_id, data):
+    """Column values for a job posted as JSON, or None if title/description are missing"""
+    title = data.get('title')
+    description = data.get('description')
+    if not title or not description:
+        return None
+    return {
+        'company_id': company_id,
+        'title': title,
+        'location': data.get('location'),
+        'description_text': description,
+        'requirements': data.get('requirements', ''),
+        'salary_range': data.get('salary_range', ''),
+        'job_type': data.get('job_type', 'Full-time'),
+        'apply_url': data.get('apply_url', ''),
+    }
+
+
 @app.route('/api/company/my-jobs', methods=['GET'])
 @jwt_required
-def api_company_my_jobs():
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+def api_company_my_jobs(user):
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
     jobs = Job.query.filter_by(company_id=user.id).order_by(Job.created_at.desc()).all()
@@ -1468,93 +2073,153 @@ def api_company_my_jobs():
 
 @app.route('/api/company/applicants', methods=['GET'])
 @jwt_required
-def api_company_applicants():
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+def api_company_applicants(user):
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
+    # Clients that ask for NDJSON get one applicant per line as rows are read, so large
+    # lists start arriving at once and are never held in memory whole
+    ndjson = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
     # Optional filter by specific job_id
     job_id_param = request.args.get('job_id', type=int)
     
-    job_ids = [job.id for job in user.jobs]
-    
     # If job_id specified, filter to just that job
     if job_id_param:
-        if job_id_param not in job_ids:
+        owned = db.session.query(
+            exists().where(Job.id == job_id_param, Job.company_id == user.id)
+        ).scalar()
+        if not owned:
             return jsonify({'error': 'Unauthorized - job not found'}), 403
-        job_ids = [job_id_param]
-    
-    if job_ids:
-        matches = Match.query.filter(
-            Match.job_id.in_(job_ids),
-            Match.is_match == True,
-            Match.application_status != 'rejected'
-        ).order_by(Match.created_at.desc()).all()
+        job_filter = Match.job_id == job_id_param
     else:
-        matches = []
-
-    applicants = []
-    for match in matches:
-        user_obj = match.user
-        resume = ResumeAnalysis.query.filter_by(user_id=user_obj.id).first()
-        
-        # Prepare resume data with all needed fields
-        resume_data = None
-        if resume and resume.extracted_json:
-            try:
-                parsed_json = json.loads(resume.extracted_json)
-                resume_data = {
-                    'analysis_score': resume.analysis_score,
-                    'profile_summary_text': resume.profile_summary_text,
-                    **parsed_json  # Includes skills, education, work_experience, etc.
-                }
-            except:
-                resume_data = None
-        
-        # Ensure match_score exists (compute & persist for older matches)
-        match_score = match.match_score
-        if match_score is None and resume and resume.extracted_json:
-            try:
-                resume_json = json.loads(resume.extracted_json)
-                job_obj = Job.query.get(match.job_id)
-                if job_obj:
-                    new_score = calculate_match_score(resume_json, job_obj.description_text or '', job_obj.requirements or '')
-                    match_score = int(new_score) if new_score is not None else None
-                    match.match_score = match_score
-                    db.session.add(match)
-                    db.session.commit()
-            except Exception as e:
-                print(f"Error computing backfill match score for applicant list: {e}")
-
-        applicants.append({
-            'match_id': match.id,
-            'user_id': user_obj.id,
-            'full_name': user_obj.full_name,
-            'email': user_obj.email,
-            'job_id': match.job_id,
-            'job_title': match.job.title,
-            'status': match.application_status,
-            'matched_at': match.created_at.isoformat(),
-            'resume': resume_data,
-            'match_score': match_score
-        })
+        # A company that hasn't posted anything has no applicants; skip the join
+        if not db.session.query(exists().where(Job.company_id == user.id)).scalar():
+            if ndjson:
+                return Response(b'', mimetype='application/x-ndjson')
+            return jsonify({'status': 'success', 'applicants': []}), 200
+        job_filter = Match.job_id.in_(_company_job_ids(user.id))
+    
+    # Load applicant, resume and job with the matches in a single SELECT
+    matches = Match.query.options(
+        joinedload(Match.user).joinedload(User.resume),
+        joinedload(Match.job)
+    ).filter(
+        job_filter,
+        Match.is_match == True,
+        Match.application_status != 'rejected'
+    ).order_by(Match.created_at.desc())
+
+    if ndjson:
+        def generate():
+            backfilled = False
+            rows = iter(matches.yield_per(200))
+            # Missing scores are computed a batch of rows at a time, in one scorer pass each
+            while batch := list(islice(rows, 200)):
+                backfilled |= _backfill_applicant_scores(batch)
+                for match in batch:
+                    yield orjson.dumps(_applicant_entry(match), option=orjson.OPT_NON_STR_KEYS) + b'\n'
+            if backfilled:
+                _commit_backfilled_scores("Error saving backfilled applicant match scores")
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    matches = matches.all()
+    if _backfill_applicant_scores(matches):
+        _commit_backfilled_scores("Error saving backfilled applicant match scores")
+    applicants = [_applicant_entry(match) for match in matches]
 
     return jsonify({'status': 'success', 'applicants': applicants}), 200
 
 
+def _backfill_applicant_scores(matches):
+    """Compute missing match_scores (older matches) in one scorer pass; returns whether any were set"""
+    unscored = [m for m in matches
+                if m.match_score is None and m.job and m.user.resume and m.user.resume.extracted_json]
+    if not unscored:
+        return False
+    try:
+        job_features = {}
+        pairs = []
+        for m in unscored:
+            if m.job_id not in job_features:
+                job_features[m.job_id] = prepare_job_features(m.job.description_text or '', m.job.requirements or '')
+            pairs.append((resume_features_of(m.user.resume), job_features[m.job_id]))
+        for m, score in zip(unscored, score_pairs(pairs)):
+            m.match_score = int(score)
+    except Exception as e:
+        logger.warning("Error computing backfill match score for applicant list: %s", e)
+        return False
+    return True
+
+
+def _applicant_entry(match):
+    """JSON entry for one applicant"""
+    user_obj = match.user
+    resume = user_obj.resume
+    
+    # Prepare resume data with all needed fields
+    resume_data = None
+    if resume and resume.extracted_json:
+        try:
+            parsed_json = resume_data_of(resume)
+            resume_data = {
+                'analysis_score': resume.analysis_score,
+                'profile_summary_text': resume.profile_summary_text,
+                **parsed_json  # Includes skills, education, work_experience, etc.
+            }
+        except:
+            resume_data = None
+    
+    return {
+        'match_id': match.id,
+        'user_id': user_obj.id,
+        'full_name': user_obj.full_name,
+        'email': user_obj.email,
+        'job_id': match.job_id,
+        'job_title': match.job.title,
+        'status': match.application_status,
+        'matched_at': match.created_at.isoformat(),
+        'resume': resume_data,
+        'match_score': match.match_score
+    }
+
+
+def _commit_backfilled_scores(message):
+    """Commit match scores computed while listing; a failure only costs the cache"""
+    try:
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        log_failure(message, e)
+
+
+# Fields of a candidate shown to companies, in response order
+_CANDIDATE_PROFILE_COLUMNS = (
+    User.id, User.full_name, User.email, User.location, User.phone,
+    User.linkedin_url, User.github_url, User.portfolio_url, User.career_objective,
+    User.projects, User.training_courses, User.work_samples,
+)
+
+
 @app.route('/api/company/candidate/<int:user_id>', methods=['GET'])
 @jwt_required
-def api_company_candidate_profile(user_id):
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+def api_company_candidate_profile(user, user_id):
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
-    candidate = User.query.get_or_404(user_id)
-    analysis = ResumeAnalysis.query.filter_by(user_id=candidate.id).first()
-    job_ids = [job.id for job in user.jobs]
-    match = Match.query.filter(
+    # Plain rows of just the profile columns; no ORM objects to hydrate
+    candidate = db.session.query(*_CANDIDATE_PROFILE_COLUMNS).filter(User.id == user_id).first()
+    if candidate is None:
+        abort(404)
+    analysis = (ResumeAnalysis.query
+                .options(load_only(ResumeAnalysis.filename, ResumeAnalysis.analysis_score, ResumeAnalysis.ats_score,
+                                   ResumeAnalysis.target_job_role, ResumeAnalysis.profile_summary_text,
+                                   ResumeAnalysis.extracted_json, ResumeAnalysis.updated_at))
+                .filter_by(user_id=user_id)
+                .first())
+    match = db.session.query(Match.id, Match.job_id, Match.application_status).filter(
         Match.user_id == user_id,
-        Match.job_id.in_(job_ids),
+        Match.job_id.in_(_company_job_ids(user.id)),
         Match.is_match == True
     ).first()
 
@@ -1562,7 +2227,7 @@ def api_company_candidate_profile(user_id):
     analysis_data = None
     if analysis and analysis.extracted_json:
         try:
-            parsed = json.loads(analysis.extracted_json)
+            parsed = resume_data_of(analysis)
             analysis_data = {
                 'filename': analysis.filename,
                 'analysis_score': analysis.analysis_score,
@@ -1571,33 +2236,16 @@ def api_company_candidate_profile(user_id):
                 'profile_summary_text': analysis.profile_summary_text,
                 'extracted_json': parsed
             }
-        except:
+        except orjson.JSONDecodeError:
             analysis_data = None
     
     # We intentionally do not compute a 'match_score' here; the profile should not expose the score.
 
     return jsonify({
         'status': 'success',
-        'user': {
-            'id': candidate.id,
-            'full_name': candidate.full_name,
-            'email': candidate.email,
-            'location': candidate.location,
-            'phone': candidate.phone,
-            'linkedin_url': candidate.linkedin_url,
-            'github_url': candidate.github_url,
-            'portfolio_url': candidate.portfolio_url,
-            'career_objective': candidate.career_objective,
-            'projects': candidate.projects,
-            'training_courses': candidate.training_courses,
-            'work_samples': candidate.work_samples
-        },
+        'user': dict(candidate._mapping),
         'analysis': analysis_data,
-        'match': {
-            'id': match.id,
-            'job_id': match.job_id,
-            'application_status': match.application_status
-        } if match else None
+        'match': dict(match._mapping) if match else None
     }), 200
 
 
@@ -1605,18 +2253,21 @@ def api_company_candidate_profile(user_id):
 
 @app.route('/api/get-next-job', methods=['GET'])
 @jwt_required
-def get_next_job():
+def get_next_job(user):
     """Get the next unswiped job for the user (JWT-only)"""
-    user = getattr(g, 'jwt_user', None)
-    if not user or user.user_type != 'jobseeker':
+    if user.user_type != 'jobseeker':
         return jsonify({'error': 'Unauthorized'}), 401
     
-    # Get list of job IDs user has already swiped on
-    swiped_job_ids = [match.job_id for match in user.matches]
+    # Jobs the user has already swiped on, checked in SQL via the (user_id, job_id) unique index
+    already_swiped = exists().where(and_(Match.user_id == user.id, Match.job_id == Job.id))
     
-    # Find one active job that isn't in the swiped list and applications are open
-    next_job = Job.query.filter(
-        Job.id.notin_(swiped_job_ids),
+    # Find one active job that hasn't been swiped on and applications are open; only the
+    # columns the card shows, with the company name joined into the same SELECT
+    next_job = db.session.query(
+        Job.id, Job.title, Job.location, Job.description_text, Job.requirements,
+        Job.job_type, Job.salary_range, Job.apply_url, Job.updated_at, Company.company_name
+    ).join(Company, Company.id == Job.company_id).filter(
+        ~already_swiped,
         Job.is_active == True,
         Job.applications_closed == False
     ).first()
@@ -1625,22 +2276,17 @@ def get_next_job():
         # Calculate AI-enhanced match score
         match_score = None
         try:
-            resume_analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
+            resume_analysis = resume_json_row(user.id)
             if resume_analysis and resume_analysis.extracted_json:
-                resume_data = json.loads(resume_analysis.extracted_json)
-                match_score = calculate_match_score(
-                    resume_data=resume_data,
-                    job_description=next_job.description_text or '',
-                    job_requirements=next_job.requirements or ''
-                )
+                match_score = cached_match_score(resume_analysis, next_job)
         except Exception as e:
-            print(f"Error calculating match score: {e}")
+            logger.warning("Error calculating match score: %s", e)
             match_score = None
         
         return jsonify({
             'jobId': next_job.id,
             'title': next_job.title,
-            'company': next_job.company.company_name,
+            'company': next_job.company_name,
             'location': next_job.location,
             'description': next_job.description_text,
             'jobType': next_job.job_type,
@@ -1653,57 +2299,70 @@ def get_next_job():
 
 @app.route('/api/swipe', methods=['POST'])
 @jwt_required
-def swipe():
+def swipe(user):
     """Record a user's swipe on a job (JWT-only)"""
-    user = getattr(g, 'jwt_user', None)
-    if not user or user.user_type != 'jobseeker':
+    if user.user_type != 'jobseeker':
         return jsonify({'error': 'Unauthorized'}), 401
     
-    data = request.get_json()
+    data = request.get_json() or {}
     job_id = data.get('jobId')
     is_like = data.get('isLike')
     
     if not job_id:
         return jsonify({'error': 'Missing jobId'}), 400
     
-    # Check if match already exists
-    existing_match = Match.query.filter_by(user_id=user.id, job_id=job_id).first()
-    
-    if not existing_match:
-        new_match = Match(
+    # The (user_id, job_id) unique constraint makes repeat swipes a no-op, no SELECT needed
+    match_id = db.session.execute(
+        insert_ignore_conflicts(Match).values(
             user_id=user.id,
             job_id=job_id,
-            is_match=is_like
-        )
-        # Compute and persist match_score at creation time if possible
-        try:
-            resume_analysis = ResumeAnalysis.query.filter_by(user_id=user.id).first()
-            if resume_analysis and resume_analysis.extracted_json:
-                resume_data = json.loads(resume_analysis.extracted_json)
-                job_obj = Job.query.get(job_id)
-                if job_obj:
-                    computed_score = calculate_match_score(
-                        resume_data=resume_data,
-                        job_description=job_obj.description_text or '',
-                        job_requirements=job_obj.requirements or ''
-                    )
-                    new_match.match_score = int(computed_score) if computed_score is not None else None
-        except Exception as e:
-            print(f"Error computing match score on swipe creation: {e}")
-
-        db.session.add(new_match)
-        db.session.commit()
-        return jsonify({'status': 'success', 'action': 'created', 'match_score': new_match.match_score}), 200
+            is_match=bool(is_like)
+        ).returning(Match.id)
+    ).scalar()
+    if match_id and is_like:
+        _bump_company_counts(_job_company_id(job_id), applicants=1)
+    db.session.commit()
+    
+    if match_id:
+        # Scored on the scoring pool so the swipe answers at once; the list endpoints
+        # backfill the score if the task hasn't stored it yet
+        match_score_executor.submit(score_match_task, match_id)
+        return jsonify({'status': 'success', 'action': 'created', 'match_score': None}), 200
     else:
         return jsonify({'status': 'success', 'action': 'already_exists'})
 
 
+def score_match_task(match_id):
+    """Compute and store the match_score of a freshly swiped match."""
+    with app.app_context():
+        match = (db.session.query(Match.user_id, Job.id, Job.updated_at, Job.description_text, Job.requirements)
+                 .join(Job, Job.id == Match.job_id)
+                 .filter(Match.id == match_id)
+                 .first())
+        if not match:
+            return
+        resume_analysis = resume_json_row(match.user_id)
+        if not (resume_analysis and resume_analysis.extracted_json):
+            return
+        try:
+            score = cached_match_score(resume_analysis, match)
+            # Leave a score some other path stored in the meantime
+            db.session.execute(
+                update(Match)
+                .where(Match.id == match_id, Match.match_score.is_(None))
+                .values(match_score=int(score))
+            )
+            db.session.commit()
+        except Exception:
+            logger.exception("Error computing match score for match %s", match_id)
+            db.session.rollback()
+
+
 @app.route('/api/company/delete-job/<int:job_id>', methods=['DELETE'])
 @jwt_required
-def delete_job(job_id):
+def delete_job(user, job_id):
     """Delete a job posting"""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
     
     job = Job.query.get_or_404(job_id)
@@ -1712,7 +2371,11 @@ def delete_job(job_id):
     if job.company_id != user.id:
         return jsonify({'error': 'Unauthorized'}), 403
     
+    # Its matches go with it (ORM cascade); recount rather than subtract so counters
+    # that were never bumped (e.g. seeded jobs) can't go negative
     db.session.delete(job)
+    db.session.flush()
+    recount_company_counters(user.id)
     db.session.commit()
     
     return jsonify({'status': 'success', 'message': 'Job deleted successfully'})
@@ -1720,10 +2383,9 @@ def delete_job(job_id):
 
 @app.route('/api/company/update-job/<int:job_id>', methods=['PUT'])
 @jwt_required
-def update_job(job_id):
+def update_job(user, job_id):
     """Update a job posting"""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
     
     job = Job.query.get_or_404(job_id)
@@ -1732,7 +2394,7 @@ def update_job(job_id):
     if job.company_id != user.id:
         return jsonify({'error': 'Unauthorized'}), 403
     
-    data = request.get_json()
+    data = request.get_json() or {}
     
     # Update fields if provided
     if 'title' in data:
@@ -1757,10 +2419,9 @@ def update_job(job_id):
 
 @app.route('/api/company/recompute-match-score', methods=['POST'])
 @jwt_required
-def api_company_recompute_match_score():
+def api_company_recompute_match_score(user):
     """Recompute and persist match_score for a single match (company-only)"""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
     data = request.get_json() or {}
@@ -1777,11 +2438,11 @@ def api_company_recompute_match_score():
         return jsonify({'error': 'Unauthorized to modify this match'}), 403
 
     try:
-        resume = ResumeAnalysis.query.filter_by(user_id=match.user_id).first()
+        resume = resume_json_row(match.user_id)
         if not resume or not resume.extracted_json:
             return jsonify({'error': 'No resume available for this user'}), 404
 
-        resume_data = json.loads(resume.extracted_json)
+        resume_data = resume_data_of(resume)
         job_obj = Job.query.get(match.job_id)
         if not job_obj:
             return jsonify({'error': 'Job not found'}), 404
@@ -1793,16 +2454,15 @@ def api_company_recompute_match_score():
 
         return jsonify({'status': 'success', 'match_id': match_id, 'match_score': match.match_score}), 200
     except Exception as e:
-        print(f"Error recomputing match score: {e}")
+        logger.warning("Error recomputing match score: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/company/recompute-job-match-scores', methods=['POST'])
 @jwt_required
-def api_company_recompute_job_match_scores():
+def api_company_recompute_job_match_scores(user):
     """Bulk recompute match_scores for a company job; returns count of updated matches"""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
 
     data = request.get_json() or {}
@@ -1816,19 +2476,32 @@ def api_company_recompute_job_match_scores():
     if job.company_id != user.id:
         return jsonify({'error': 'Unauthorized - job not owned by company'}), 403
 
-    matches = Match.query.filter_by(job_id=job_id).all()
+    # Each match with its applicant's resume in one JOIN, streamed in batches so a
+    # popular job's applicants are never all in memory at once
+    rows = db.session.execute(
+        select(Match.id, ResumeAnalysis)
+        .join(ResumeAnalysis, ResumeAnalysis.user_id == Match.user_id)
+        .where(Match.job_id == job_id, ResumeAnalysis.extracted_json.isnot(None))
+        # Same projection as resume_json_row(): the resume body stays in the database
+        .options(load_only(ResumeAnalysis.extracted_json, ResumeAnalysis.updated_at))
+        .execution_options(yield_per=500)
+    )
+    # The job side is prepared once; each resume side comes from the per-version cache
+    job_features = prepare_job_features(job.description_text or '', job.requirements or '')
     updated = 0
-    for m in matches:
-        try:
-            resume = ResumeAnalysis.query.filter_by(user_id=m.user_id).first()
-            if resume and resume.extracted_json:
-                resume_data = json.loads(resume.extracted_json)
-                rescore = calculate_match_score(resume_data=resume_data, job_description=job.description_text or '', job_requirements=job.requirements or '')
-                m.match_score = int(rescore) if rescore is not None else None
-                db.session.add(m)
-                updated += 1
-        except Exception as e:
-            print(f"Error recomputing for match {m.id}: {e}")
+    for batch in rows.partitions():
+        scores = []
+        for match_id, resume in batch:
+            try:
+                rescore = score_against(resume_features_of(resume), job_features)
+                scores.append({'id': match_id, 'match_score': int(rescore) if rescore is not None else None})
+            except Exception as e:
+                logger.warning("Error recomputing for match %s: %s", match_id, e)
+        if scores:
+            # ORM bulk UPDATE by primary key: one executemany per batch, no Match objects loaded
+            db.session.execute(update(Match), scores)
+            updated += len(scores)
+    # Committed once at the end: committing mid-stream would close the server-side cursor
     db.session.commit()
     return jsonify({'status': 'success', 'job_id': job_id, 'updated': updated}), 200
 
@@ -1837,31 +2510,32 @@ def api_company_recompute_job_match_scores():
 
 @app.route('/api/company/update-application-status', methods=['PUT'])
 @jwt_required
-def update_application_status():
+def update_application_status(user):
     """Company can accept or reject an application"""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
     
-    data = request.get_json()
+    data = request.get_json() or {}
     match_id = data.get('match_id')
     new_status = data.get('status')  # 'accepted' or 'rejected'
     
     if not match_id:
         return jsonify({'error': 'Match ID required'}), 400
     
-    match = Match.query.get_or_404(match_id)
-    job = Job.query.get_or_404(match.job_id)
-    
-    # Verify this company owns the job
-    if job.company_id != user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
     if new_status not in ['pending', 'accepted', 'rejected']:
         return jsonify({'error': 'Invalid status'}), 400
     
-    match.application_status = new_status
+    # One UPDATE; the job-ownership subquery doubles as the authorization check
+    result = db.session.execute(
+        update(Match)
+        .where(Match.id == match_id, Match.job_id.in_(_company_job_ids(user.id)))
+        .values(application_status=new_status)
+    )
     db.session.commit()
+    if not result.rowcount:
+        if not db.session.query(exists().where(Match.id == match_id)).scalar():
+            abort(404)
+        return jsonify({'error': 'Unauthorized'}), 403
     
     return jsonify({
         'status': 'success', 
@@ -1872,156 +2546,185 @@ def update_application_status():
 
 @app.route('/api/company/close-applications', methods=['PUT'])
 @jwt_required
-def close_applications():
+def close_applications(user):
     """Company can close applications for a job"""
-    user = _get_request_user()
-    if not user or user.user_type != 'company':
+    if user.user_type != 'company':
         return jsonify({'error': 'Unauthorized'}), 401
     
-    data = request.get_json()
+    data = request.get_json() or {}
     job_id = data.get('job_id')
     should_close = data.get('close', True)
     
     if not job_id:
         return jsonify({'error': 'Job ID required'}), 400
     
-    job = Job.query.get_or_404(job_id)
-    
-    # Verify this company owns the job
-    if job.company_id != user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
-    job.applications_closed = should_close
+    # One UPDATE; the company_id filter doubles as the ownership check
+    result = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.company_id == user.id)
+        .values(applications_closed=bool(should_close))
+    )
     db.session.commit()
+    if not result.rowcount:
+        if not db.session.query(exists().where(Job.id == job_id)).scalar():
+            abort(404)
+        return jsonify({'error': 'Unauthorized'}), 403
     
-    status_text = 'closed' if job.applications_closed else 'reopened'
+    status_text = 'closed' if should_close else 'reopened'
     return jsonify({
         'status': 'success',
         'message': f'Applications {status_text}',
-        'applications_closed': job.applications_closed
+        'applications_closed': bool(should_close)
     })
 
 
+def _set_match_hidden(match_id, user_id, hidden):
+    """Hide/unhide a match owned by user_id in one UPDATE; returns False if no such match"""
+    relax_commit_durability()
+    updated = Match.query.filter_by(id=match_id, user_id=user_id).update(
+        {'is_hidden_by_user': hidden}, synchronize_session=False
+    )
+    db.session.commit()
+    return updated > 0
+
+
 @app.route('/api/hide-match/<int:match_id>', methods=['PUT'])
-@login_required
+@jobseeker_api
 def hide_match(match_id):
     """Job seeker can hide a matched job"""
-    match = Match.query.get_or_404(match_id)
-    
-    # Verify this user owns the match
-    if match.user_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
-    match.is_hidden_by_user = True
-    db.session.commit()
+    # The user_id filter doubles as the ownership check
+    if not _set_match_hidden(match_id, current_user.id, True):
+        return jsonify({'error': 'Match not found'}), 404
     
     return jsonify({'status': 'success', 'message': 'Job hidden from matches'})
 
 
 @app.route('/api/jwt/hide-match/<int:match_id>', methods=['PUT'])
 @jwt_required
-def jwt_hide_match(match_id):
+def jwt_hide_match(user, match_id):
     """JWT-compatible endpoint for hiding a match"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
+    if user.user_type != 'jobseeker':
         return jsonify({'error': 'Unauthorized'}), 401
-    match = Match.query.get_or_404(match_id)
-    if match.user_id != user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    match.is_hidden_by_user = True
-    db.session.commit()
+    if not _set_match_hidden(match_id, user.id, True):
+        return jsonify({'error': 'Match not found'}), 404
     return jsonify({'status': 'success', 'message': 'Job hidden from matches'})
 
 
 @app.route('/api/unhide-match/<int:match_id>', methods=['PUT'])
-@login_required
+@jobseeker_api
 def unhide_match(match_id):
     """Job seeker can unhide a hidden job"""
-    match = Match.query.get_or_404(match_id)
-    
-    # Verify this user owns the match
-    if match.user_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
-    match.is_hidden_by_user = False
-    db.session.commit()
+    # The user_id filter doubles as the ownership check
+    if not _set_match_hidden(match_id, current_user.id, False):
+        return jsonify({'error': 'Match not found'}), 404
     
     return jsonify({'status': 'success', 'message': 'Job restored to matches'})
 
 
 @app.route('/api/jwt/unhide-match/<int:match_id>', methods=['PUT'])
 @jwt_required
-def jwt_unhide_match(match_id):
+def jwt_unhide_match(user, match_id):
     """JWT-compatible endpoint for unhiding a match"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
+    if user.user_type != 'jobseeker':
         return jsonify({'error': 'Unauthorized'}), 401
-    match = Match.query.get_or_404(match_id)
-    if match.user_id != user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    match.is_hidden_by_user = False
-    db.session.commit()
+    if not _set_match_hidden(match_id, user.id, False):
+        return jsonify({'error': 'Match not found'}), 404
     return jsonify({'status': 'success', 'message': 'Job restored to matches'})
 
 
+def _reapply(user_id, job_id):
+    """Turn a user's dislike into a pending like with one UPDATE; returns False if no match"""
+    relax_commit_durability()
+    values = dict(is_match=True, application_status='pending', is_hidden_by_user=False)
+    result = db.session.execute(
+        update(Match)
+        .where(Match.user_id == user_id, Match.job_id == job_id, Match.is_match == False)
+        .values(**values)
+    )
+    if result.rowcount:
+        # A dislike became a like: one more applicant for the job's company
+        _bump_company_counts(_job_company_id(job_id), applicants=1)
+    else:
+        # Already a like (or no match at all); just reset its status
+        result = db.session.execute(
+            update(Match)
+            .where(Match.user_id == user_id, Match.job_id == job_id)
+            .values(**values)
+        )
+    db.session.commit()
+    return result.rowcount > 0
+
+
 @app.route('/api/reapply/<int:job_id>', methods=['POST'])
-@login_required
+@jobseeker_api
 def reapply_to_job(job_id):
     """Change a dislike to a like (reapply to skipped job)"""
-    match = Match.query.filter_by(user_id=current_user.id, job_id=job_id).first()
-    
-    if not match:
+    if not _reapply(current_user.id, job_id):
         return jsonify({'error': 'Match not found'}), 404
     
-    # Change dislike to like
-    match.is_match = True
-    match.application_status = 'pending'
-    match.is_hidden_by_user = False
-    db.session.commit()
-    
     return jsonify({'status': 'success', 'message': 'Application submitted successfully'})
 
 
 @app.route('/api/jwt/reapply/<int:job_id>', methods=['POST'])
 @jwt_required
-def jwt_reapply_to_job(job_id):
+def jwt_reapply_to_job(user, job_id):
     """JWT-compatible endpoint for re-applying to a skipped job"""
-    user = getattr(g, 'jwt_user', None)
-    if not user:
+    if user.user_type != 'jobseeker':
         return jsonify({'error': 'Unauthorized'}), 401
-    match = Match.query.filter_by(user_id=user.id, job_id=job_id).first()
-    if not match:
+    if not _reapply(user.id, job_id):
         return jsonify({'error': 'Match not found'}), 404
-    match.is_match = True
-    match.application_status = 'pending'
-    match.is_hidden_by_user = False
-    db.session.commit()
     return jsonify({'status': 'success', 'message': 'Application submitted successfully'})
 
 
 @app.route('/api/get-resume-feedback', methods=['POST'])
-@jobseeker_required
+@jobseeker_api
 def api_get_resume_feedback():
     """Get AI-powered resume feedback for improvement"""
-    data = request.get_json()
+    data = request.get_json() or {}
     target_job = data.get('target_job', 'Software Engineer')
     
     # Get user's resume analysis
-    analysis = ResumeAnalysis.query.filter_by(user_id=current_user.id).first()
+    analysis = resume_json_row(current_user.id)
     if not analysis or not analysis.extracted_json:
         return jsonify({'error': 'Please upload a resume first'}), 404
     
     try:
-        extracted_data = json.loads(analysis.extracted_json)
+        extracted_data = resume_data_of(analysis)
+    except ValueError as e:
+        log_failure("Stored resume data is not valid JSON", e)
+        return jsonify({'error': 'Please upload your resume again'}), 500
+    
+    try:
         feedback = get_resume_feedback(extracted_data, target_job)
-        
-        if feedback:
-            return jsonify({'status': 'success', 'feedback': feedback}), 200
-        else:
-            return jsonify({'error': 'Failed to generate feedback'}), 500
-    except Exception as e:
-        print(f"Error generating feedback: {e}")
-        return jsonify({'error': 'An error occurred while generating feedback'}), 500
+    except (ValueError, TimeoutError, ConnectionError) as e:
+        log_failure("Error generating feedback", e)
+        feedback = None
+    
+    if feedback:
+        return jsonify({'status': 'success', 'feedback': feedback}), 200
+    return jsonify({'error': 'Failed to generate feedback'}), 500
+
+
+def upsert_session_roadmap(user_id, target_job, roadmap_json):
+    """Overwrite the user's first roadmap in place, inserting it only on the first save.
+
+    The JWT API keeps a history of roadmaps per user, so user_id can't carry a unique
+    constraint for ON CONFLICT; instead the UPDATE targets the oldest row directly and
+    the common case is a single statement.
+    """
+    first_id = (
+        select(func.min(CareerRoadmap.id))
+        .where(CareerRoadmap.user_id == user_id)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(CareerRoadmap)
+        .where(CareerRoadmap.id == first_id)
+        .values(target_job=target_job, roadmap_json=roadmap_json, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        db.session.add(CareerRoadmap(user_id=user_id, target_job=target_job, roadmap_json=roadmap_json))
+    db.session.commit()
 
 
 @app.route('/career-roadmap')
@@ -2029,69 +2732,66 @@ def api_get_resume_feedback():
 def career_roadmap():
     """View career roadmap page"""
     # Get user's latest roadmap
-    roadmap = CareerRoadmap.query.filter_by(user_id=current_user.id).order_by(CareerRoadmap.updated_at.desc()).first()
+    roadmap = (CareerRoadmap.query
+               .options(load_only(CareerRoadmap.target_job, CareerRoadmap.roadmap_json, CareerRoadmap.updated_at))
+               .filter_by(user_id=current_user.id)
+               .order_by(CareerRoadmap.updated_at.desc())
+               .first())
     
     # Parse roadmap JSON if exists
     roadmap_data = None
     if roadmap:
         try:
-            roadmap_data = json.loads(roadmap.roadmap_json)
-        except:
+            roadmap_data = roadmap_data_of(roadmap)
+        except orjson.JSONDecodeError:
             roadmap_data = None
     
     return render_template('career_roadmap.html', roadmap=roadmap, roadmap_data=roadmap_data)
 
 
 @app.route('/api/generate-career-roadmap', methods=['POST'])
-@jobseeker_required
+@jobseeker_api
 def api_generate_career_roadmap():
     """Generate and save a personalized career roadmap"""
-    data = request.get_json()
+    data = request.get_json() or {}
     target_job = data.get('target_job', 'Software Engineer')
     
     # Get user's resume analysis
-    analysis = ResumeAnalysis.query.filter_by(user_id=current_user.id).first()
+    analysis = resume_json_row(current_user.id)
     if not analysis or not analysis.extracted_json:
         return jsonify({'error': 'Please upload a resume first'}), 404
     
     try:
-        extracted_data = json.loads(analysis.extracted_json)
-        print(f"Generating roadmap for target job: {target_job}")
-        print(f"Current skills: {extracted_data.get('skills', [])}")
-        
+        extracted_data = resume_data_of(analysis)
+    except ValueError as e:
+        log_failure("Stored resume data is not valid JSON", e)
+        return jsonify({'error': 'Please upload your resume again'}), 500
+    
+    logger.debug("Generating roadmap for target job: %s", target_job)
+    logger.debug("Current skills: %s", extracted_data.get('skills', []))
+    
+    try:
         roadmap = get_career_roadmap(extracted_data, target_job)
-        
-        if roadmap:
-            print(f"Roadmap generated successfully with {len(roadmap)} phases")
-            
-            # Save or update roadmap in database
-            existing_roadmap = CareerRoadmap.query.filter_by(user_id=current_user.id).first()
-            
-            if existing_roadmap:
-                # Update existing roadmap
-                existing_roadmap.target_job = target_job
-                existing_roadmap.roadmap_json = json.dumps(roadmap)
-                existing_roadmap.updated_at = datetime.utcnow()
-            else:
-                # Create new roadmap
-                new_roadmap = CareerRoadmap(
-                    user_id=current_user.id,
-                    target_job=target_job,
-                    roadmap_json=json.dumps(roadmap)
-                )
-                db.session.add(new_roadmap)
-            
-            db.session.commit()
-            
-            return jsonify({'status': 'success', 'roadmap': roadmap}), 200
-        else:
-            print("Roadmap generation returned None")
-            return jsonify({'error': 'Failed to generate roadmap'}), 500
-    except Exception as e:
-        print(f"Error generating roadmap: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+    except (ValueError, TimeoutError, ConnectionError) as e:
+        log_failure("Error generating roadmap", e)
+        roadmap = None
+    
+    if not roadmap:
+        logger.warning("Roadmap generation returned None")
+        return jsonify({'error': 'Failed to generate roadmap'}), 500
+    
+    logger.debug("Roadmap generated successfully with %d phases", len(roadmap))
+    
+    # Save or update roadmap in database
+    roadmap_json = _dumps(roadmap)
+    try:
+        upsert_session_roadmap(current_user.id, target_job, roadmap_json)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        log_failure("Error saving roadmap", e)
+        return jsonify({'error': 'Failed to save roadmap'}), 500
+    
+    return roadmap_response(roadmap_json)
 
 
 # ============================================
@@ -2100,10 +2800,8 @@ def api_generate_career_roadmap():
 
 @app.route('/api/latex-resumes', methods=['GET'])
 @jwt_required
-def get_latex_resumes():
+def get_latex_resumes(user):
     """Get all LaTeX resumes for the current user"""
-    user = _get_request_user()
-    
     resumes = LatexResume.query.filter_by(user_id=user.id).order_by(LatexResume.updated_at.desc()).all()
     
     return jsonify([{
@@ -2118,10 +2816,8 @@ def get_latex_resumes():
 
 @app.route('/api/latex-resumes/<int:resume_id>', methods=['GET'])
 @jwt_required
-def get_latex_resume(resume_id):
+def get_latex_resume(user, resume_id):
     """Get a specific LaTeX resume"""
-    user = _get_request_user()
-    
     resume = LatexResume.query.filter_by(id=resume_id, user_id=user.id).first()
     if not resume:
         return jsonify({'error': 'Resume not found'}), 404
@@ -2140,10 +2836,9 @@ def get_latex_resume(resume_id):
 
 @app.route('/api/latex-resumes', methods=['POST'])
 @jwt_required
-def create_latex_resume():
+def create_latex_resume(user):
     """Create a new LaTeX resume"""
-    user = _get_request_user()
-    data = request.get_json()
+    data = request.get_json() or {}
     
     title = data.get('title', 'Untitled Resume')
     template_name = data.get('template_name', 'default')
@@ -2175,10 +2870,9 @@ def create_latex_resume():
 
 @app.route('/api/latex-resumes/<int:resume_id>', methods=['PUT'])
 @jwt_required
-def update_latex_resume(resume_id):
+def update_latex_resume(user, resume_id):
     """Update a LaTeX resume"""
-    user = _get_request_user()
-    data = request.get_json()
+    data = request.get_json() or {}
     
     resume = LatexResume.query.filter_by(id=resume_id, user_id=user.id).first()
     if not resume:
@@ -2205,10 +2899,8 @@ def update_latex_resume(resume_id):
 
 @app.route('/api/latex-resumes/<int:resume_id>', methods=['DELETE'])
 @jwt_required
-def delete_latex_resume(resume_id):
+def delete_latex_resume(user, resume_id):
     """Delete a LaTeX resume"""
-    user = _get_request_user()
-    
     resume = LatexResume.query.filter_by(id=resume_id, user_id=user.id).first()
     if not resume:
         return jsonify({'error': 'Resume not found'}), 404
@@ -2221,10 +2913,8 @@ def delete_latex_resume(resume_id):
 
 @app.route('/api/latex-resumes/<int:resume_id>/set-active', methods=['POST'])
 @jwt_required
-def set_active_latex_resume(resume_id):
+def set_active_latex_resume(user, resume_id):
     """Set a resume as the active one"""
-    user = _get_request_user()
-    
     resume = LatexResume.query.filter_by(id=resume_id, user_id=user.id).first()
     if not resume:
         return jsonify({'error': 'Resume not found'}), 404
@@ -2243,10 +2933,10 @@ def set_active_latex_resume(resume_id):
 
 @app.route('/api/chat/conversations', methods=['GET'])
 @jwt_required
-def get_conversations():
+def get_conversations(user):
     """Get all conversations for the logged-in user"""
-    user_id = g.user_id
-    user_type = g.user_type
+    user_id = user.id
+    user_type = user.user_type
     
     if user_type == 'jobseeker':
         conversations = Conversation.query.filter_by(user_id=user_id).order_by(Conversation.last_message_at.desc()).all()
@@ -2287,10 +2977,10 @@ def get_conversations():
 
 @app.route('/api/chat/conversations/<int:conversation_id>/messages', methods=['GET'])
 @jwt_required
-def get_messages(conversation_id):
+def get_messages(user, conversation_id):
     """Get all messages for a specific conversation"""
-    user_id = g.user_id
-    user_type = g.user_type
+    user_id = user.id
+    user_type = user.user_type
     
     # Verify the user has access to this conversation
     conversation = Conversation.query.get_or_404(conversation_id)
@@ -2326,10 +3016,10 @@ def get_messages(conversation_id):
 
 @app.route('/api/chat/conversations', methods=['POST'])
 @jwt_required
-def create_conversation():
+def create_conversation(user):
     """Create a new conversation for an accepted match"""
-    user_id = g.user_id
-    user_type = g.user_type
+    user_id = user.id
+    user_type = user.user_type
     
     data = request.get_json() or {}
     match_id = data.get('match_id')
@@ -2384,13 +3074,13 @@ def create_conversation():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
-    print(f'Client connected: {request.sid}')
+    logger.debug('Client connected: %s', request.sid)
 
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
-    print(f'Client disconnected: {request.sid}')
+    logger.debug('Client disconnected: %s', request.sid)
 
 
 @socketio.on('join')
@@ -2427,7 +3117,7 @@ def handle_join(data):
     # Join the room
     room = f'conversation_{conversation_id}'
     join_room(room)
-    print(f'User {user_id} ({user_type}) joined room {room}')
+    logger.debug('User %s (%s) joined room %s', user_id, user_type, room)
     emit('joined', {'conversation_id': conversation_id})
 
 
@@ -2441,7 +3131,7 @@ def handle_leave(data):
     
     room = f'conversation_{conversation_id}'
     leave_room(room)
-    print(f'Client {request.sid} left room {room}')
+    logger.debug('Client %s left room %s', request.sid, room)
 
 
 @socketio.on('send_message')
@@ -2503,9 +3193,65 @@ def handle_send_message(data):
     }, room=room)
 
 
+# --- CLI COMMANDS ---
+@app.cli.command('init-db')
+def init_db_command():
+    """Create all database tables (run once before the first start)"""
+    db.create_all()
+    print("Database tables created successfully!")
+
+
+@app.cli.command('rescore-resumes')
+def rescore_resumes_command():
+    """Recompute every stored analysis_score (e.g. after changing RESUME_SCORE_WEIGHTS)"""
+    rows = db.session.execute(
+        select(ResumeAnalysis.id, ResumeAnalysis.extracted_json)
+        .where(ResumeAnalysis.extracted_json.isnot(None))
+        .execution_options(yield_per=500)
+    )
+    updated = skipped = 0
+    for batch in rows.partitions():
+        ids, results = [], []
+        for analysis_id, extracted_json in batch:
+            # A malformed or legacy row is skipped so it can't abort the batches already rescored
+            try:
+                result = _loads(extracted_json)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Skipping resume analysis %s with unreadable extracted_json: %s", analysis_id, e)
+                skipped += 1
+                continue
+            if not isinstance(result, dict):
+                logger.warning("Skipping resume analysis %s: extracted_json is not an object", analysis_id)
+                skipped += 1
+                continue
+            ids.append(analysis_id)
+            results.append(result)
+        if not ids:
+            continue
+        scores = calculate_resume_scores(results)
+        # ORM bulk UPDATE by primary key: one executemany per batch
+        db.session.execute(update(ResumeAnalysis), [
+            {'id': analysis_id, 'analysis_score': int(score)} for analysis_id, score in zip(ids, scores)
+        ])
+        updated += len(ids)
+    # Committed once at the end: committing mid-stream would close the server-side cursor
+    db.session.commit()
+    print(f"Rescored {updated} resume(s), skipped {skipped} unreadable")
+
+
+@app.cli.command('requeue-analyses')
+def requeue_analyses_command():
+    """Re-run resume analyses left 'processing' by a restart and wait for them to finish"""
+    # The worker pool lives in the web process, so queued uploads die with it
+    pending = (db.session.query(ResumeAnalysis.user_id, ResumeAnalysis.filename, ResumeAnalysis.score_ats)
+               .filter(ResumeAnalysis.status == 'processing', ResumeAnalysis.filename.isnot(None))
+               .all())
+    for user_id, filename, score_ats in pending:
+        resume_executor.submit(analyze_resume_task, user_id, str(UPLOAD_DIR / filename), bool(score_ats))
+    resume_executor.shutdown(wait=True)
+    print(f"Re-analyzed {len(pending)} resume(s)")
+
+
 # --- MAIN EXECUTION ---
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-        print("Database tables created successfully!")
     socketio.run(app, debug=True, port=5000)
@@ -2,7 +2,9 @@ import os
 import json
 import google.generativeai as genai
 from dotenv import load_dotenv
+from core_logic.llm_cache import memoize_llm
 
+@memoize_llm
 def extract_resume_data(resume_text: str) -> dict | None:
     """
     Uses the FAST 'gemini-flash-latest' model for simple data extraction.
@@ -2,7 +2,9 @@ import os
 import json
 import google.generativeai as genai
 from dotenv import load_dotenv
+from core_logic.llm_cache import memoize_llm
 
+@memoize_llm
 def calculate_ats_score(extracted_data: dict, target_job_role: str = None) -> dict | None:
     """
     Calculate ATS score for a resume based on extracted data.
@@ -97,6 +99,7 @@ def calculate_ats_score(extracted_data: dict, target_job_role: str = None) -> di
         return None
 
 
+@memoize_llm
 def get_profile_enhancement(extracted_data: dict, resume_text: str) -> dict | None:
     """
     Get detailed profile enhancement recommendations.
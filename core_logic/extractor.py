@@ -1,14 +1,34 @@
 import fitz  # PyMuPDF
 
+# Resumes longer than this are truncated; the LLM prompt never needs more
+MAX_RESUME_CHARS = 50000
+
+def _collect_page_text(doc) -> str:
+    pages = []
+    total = 0
+    # Walk pages one at a time and stop early once we have enough text
+    for page in doc:
+        text = page.get_text("text")  # type: ignore
+        pages.append(text)
+        total += len(text)
+        if total >= MAX_RESUME_CHARS:
+            break
+    return "\n".join(pages)[:MAX_RESUME_CHARS]
+
 def extract_text_from_pdf(pdf_path: str) -> str | None:
     try:
-        # Open the PDF document using fitz
-        doc = fitz.open(pdf_path)
-        
-        # Join the text from all pages into a single string
-        text = "".join(page.get_text() for page in doc)  # type: ignore
-        
-        return text
+        # Open the PDF document using fitz and close it as soon as we're done
+        with fitz.open(pdf_path) as doc:
+            return _collect_page_text(doc)
     except Exception as e:
         print(f"🛑 Error reading or extracting text from PDF {pdf_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def extract_text_from_bytes(data: bytes, filetype: str = "pdf") -> str | None:
+    """Extract text from an in-memory upload without writing it to disk first."""
+    try:
+        with fitz.open(stream=data, filetype=filetype) as doc:
+            return _collect_page_text(doc)
+    except Exception as e:
+        print(f"🛑 Error reading or extracting text from uploaded {filetype}: {e}")
+        return None
@@ -2,7 +2,9 @@ import os
 import json
 import google.generativeai as genai
 from dotenv import load_dotenv
+from core_logic.llm_cache import memoize_llm
 
+@memoize_llm
 def get_resume_feedback(extracted_data: dict, target_job_profile: str) -> dict | None:
     """
     Uses the POWERFUL 'gemini-pro-latest' model for deep analysis and feedback.
@@ -72,6 +74,7 @@ def get_resume_feedback(extracted_data: dict, target_job_profile: str) -> dict |
         return None
 
 
+@memoize_llm
 def get_career_roadmap(extracted_data: dict, target_job_profile: str) -> dict | None:
     """
     Uses Gemini Pro to generate a flowchart-style career roadmap.
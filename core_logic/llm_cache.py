@@ -0,0 +1,38 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from functools import wraps
+
+from cachetools import TTLCache
+
+# Identical inputs (e.g. re-uploading the same resume) give the same answer, so
+# keep successful Gemini responses in memory keyed by a hash of the arguments.
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_SIZE = int(os.environ.get("LLM_CACHE_SIZE", 512))
+
+
+def memoize_llm(fn):
+    """Cache non-empty results of an LLM call by the SHA-256 of its arguments."""
+    cache = TTLCache(maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+    lock = threading.Lock()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        payload = json.dumps([args, kwargs], sort_keys=True, default=str)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        with lock:
+            hit = cache.get(key)
+        if hit is not None:
+            # Callers may mutate the result, so never hand out the cached object
+            return copy.deepcopy(hit)
+
+        result = fn(*args, **kwargs)
+        if result:
+            with lock:
+                cache[key] = copy.deepcopy(result)
+        return result
+
+    wrapper.cache = cache
+    return wrapper
@@ -2,10 +2,37 @@
 AI-Enhanced Job Matching using TF-IDF and Cosine Similarity
 """
 import json
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import re
+from typing import NamedTuple
+from sklearn.feature_extraction.text import CountVectorizer
 import numpy as np
 
+# Word tokenizer of the keyword fallback, compiled once per process
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+class ResumeFeatures(NamedTuple):
+    """Resume-side inputs of the scorer, derived once per stored resume version"""
+    text: str
+    skills: tuple[str, ...]
+
+
+class JobFeatures(NamedTuple):
+    """Job-side inputs of the scorer, derived once per job when scoring many resumes"""
+    text: str
+    text_lower: str
+
+
+def prepare_resume_features(resume_data: dict) -> ResumeFeatures:
+    """Flatten a resume into the text and normalised skills the scorer compares against jobs"""
+    return ResumeFeatures(_extract_resume_text(resume_data), _resume_skills(resume_data))
+
+
+def prepare_job_features(job_description: str, job_requirements: str) -> JobFeatures:
+    """Combine a job's description and requirements into the text the scorer compares against resumes"""
+    job_text = f"{job_description} {job_requirements}".strip()
+    return JobFeatures(job_text, job_text.lower())
+
 
 def calculate_match_score(resume_data: dict, job_description: str, job_requirements: str) -> int:
     """
@@ -19,51 +46,128 @@ def calculate_match_score(resume_data: dict, job_description: str, job_requireme
     Returns:
         Match score between 0-100
     """
+    return score_against(resume_data, prepare_job_features(job_description, job_requirements))
+
+
+def score_against(resume: dict | ResumeFeatures, job: JobFeatures) -> int:
+    """
+    Match score (0-100) of one resume against a prepared job.
+    
+    Same result as calculate_match_score(); scoring many resumes against one job
+    prepares the job side once instead of once per resume.
+    """
     try:
-        # Extract resume text from structured data
-        resume_text = _extract_resume_text(resume_data)
-        
-        # Combine job description and requirements
-        job_text = f"{job_description} {job_requirements}".strip()
-        
-        if not resume_text or not job_text:
-            return 0
-        
-        # Create TF-IDF vectorizer with optimized parameters for job matching
-        vectorizer = TfidfVectorizer(
-            max_features=500,  # Limit features for performance
-            stop_words='english',  # Remove common words
-            ngram_range=(1, 2),  # Include unigrams and bigrams
-            min_df=1,  # Minimum document frequency
-            lowercase=True,
-            strip_accents='unicode'
-        )
-        
-        # Vectorize both texts
-        try:
-            tfidf_matrix = vectorizer.fit_transform([resume_text, job_text])
-        except ValueError:
-            # Fallback if vectorization fails (e.g., empty vocabulary)
-            return _fallback_keyword_match(resume_data, job_text)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        
-        # Convert to 0-100 scale
-        base_score = int(similarity * 100)
-        
-        # Apply skill-based boost
-        skill_boost = _calculate_skill_boost(resume_data, job_text)
-        
-        # Final score with boost (capped at 100)
-        final_score = min(100, base_score + skill_boost)
-        
-        return final_score
-        
+        if not isinstance(resume, ResumeFeatures):
+            resume = prepare_resume_features(resume)
+        return score_pairs([(resume, job)])[0]
     except Exception as e:
         print(f"Error calculating match score: {e}")
         # Fallback to simple keyword matching
-        return _fallback_keyword_match(resume_data, f"{job_description} {job_requirements}")
+        try:
+            return _keyword_match(resume.skills, job.text)
+        except Exception:
+            return 0
+
+
+def calculate_match_scores(resume: dict | ResumeFeatures, jobs: list[tuple[str, str]]) -> list[int]:
+    """
+    Score one resume against many jobs in a single vectorizer pass.
+    
+    Args:
+        resume: Extracted resume dictionary, or its prepare_resume_features() result
+        jobs: (job_description, job_requirements) pairs
+    
+    Returns:
+        Match scores between 0-100, in the same order as jobs
+    """
+    if not isinstance(resume, ResumeFeatures):
+        resume = prepare_resume_features(resume)
+    return score_pairs([(resume, prepare_job_features(description, requirements))
+                        for description, requirements in jobs])
+
+
+def score_pairs(pairs: list[tuple[ResumeFeatures, JobFeatures]]) -> list[int]:
+    """
+    Match scores (0-100) of many (resume, job) pairs in a single vectorizer pass.
+    
+    Every score equals the one calculate_match_score() gives that pair on its own,
+    so a stored score doesn't depend on which endpoint computed it.
+    """
+    scored = [i for i, (resume, job) in enumerate(pairs) if resume.text and job.text]
+    scores = [0] * len(pairs)
+    if not scored:
+        return scores
+    
+    try:
+        similarities = batch_match_scores(
+            [pairs[i][0].text for i in scored],
+            [pairs[i][1].text for i in scored]
+        )
+    except ValueError:
+        # Empty vocabulary across the whole batch
+        similarities = [np.nan] * len(scored)
+    
+    for i, similarity in zip(scored, similarities):
+        resume, job = pairs[i]
+        if np.isnan(similarity):
+            # Fallback if the pair has no vocabulary of its own
+            scores[i] = _keyword_match(resume.skills, job.text)
+        else:
+            # Final score with skill-based boost (capped at 100)
+            scores[i] = min(100, int(similarity) + _skill_boost(resume.skills, job.text_lower))
+    return scores
+
+
+# IDF of a term found in one document of a two-document corpus (smoothed, as TfidfVectorizer does);
+# a term found in both has IDF ln(3/3) + 1 = 1
+_SINGLE_DOC_IDF = np.log(3 / 2) + 1
+
+
+def batch_match_scores(resume_texts: list[str], job_texts: list[str]) -> np.ndarray:
+    """
+    Cosine similarity (0-100) of each resume_texts[i] with job_texts[i].
+    
+    Tokenizes all texts with a single vectorizer fit, then derives for every pair the
+    TF-IDF cosine a two-document TfidfVectorizer fit on just that pair would give: each
+    pair's IDF only depends on which of its terms the two documents share.
+    
+    Returns:
+        Array of len(resume_texts) similarities; NaN where a pair has no vocabulary
+    """
+    texts = list(dict.fromkeys(resume_texts + job_texts))
+    row = {text: i for i, text in enumerate(texts)}
+    counts = _make_vectorizer().fit_transform(texts).astype(np.float64).tocsr()
+    R = counts[[row[t] for t in resume_texts]]
+    J = counts[[row[t] for t in job_texts]]
+    R_sq, J_sq = R.multiply(R), J.multiply(J)
+    R_has, J_has = (R > 0).astype(np.float64), (J > 0).astype(np.float64)
+    
+    def row_sums(m):
+        return np.asarray(m.sum(axis=1)).ravel()
+    
+    # Shared terms weigh 1 on both sides, so they alone make up the dot product
+    dot = row_sums(R.multiply(J))
+    idf_sq = _SINGLE_DOC_IDF ** 2
+    resume_norm_sq = idf_sq * row_sums(R_sq) - (idf_sq - 1) * row_sums(R_sq.multiply(J_has))
+    job_norm_sq = idf_sq * row_sums(J_sq) - (idf_sq - 1) * row_sums(J_sq.multiply(R_has))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similarity = dot / np.sqrt(resume_norm_sq * job_norm_sq)
+    similarity = np.where((resume_norm_sq > 0) & (job_norm_sq > 0), similarity, 0.0)
+    # Neither side has a term: a pair fit would find no vocabulary at all
+    similarity[(resume_norm_sq == 0) & (job_norm_sq == 0)] = np.nan
+    return similarity * 100
+
+
+def _make_vectorizer() -> CountVectorizer:
+    """Term counter with optimized parameters for job matching"""
+    return CountVectorizer(
+        stop_words='english',  # Remove common words
+        ngram_range=(1, 2),  # Include unigrams and bigrams
+        min_df=1,  # Minimum document frequency
+        lowercase=True,
+        strip_accents='unicode'
+    )
 
 
 def _extract_resume_text(resume_data: dict) -> str:
@@ -126,62 +230,45 @@ def _extract_resume_text(resume_data: dict) -> str:
     return ' '.join(clean_parts)
 
 
-def _calculate_skill_boost(resume_data: dict, job_text: str) -> int:
+def _resume_skills(resume_data: dict) -> tuple[str, ...]:
     """
-    Calculate additional boost based on exact skill matches.
-    Returns: 0-15 boost points
+    Lower-cased, stripped skills of a resume (empty if the resume has no skill list).
     """
-    try:
-        # Extract skills from resume
-        skills = resume_data.get('skills') or resume_data.get('skills_extracted') or resume_data.get('keywords') or []
-        if not isinstance(skills, list):
-            return 0
-        
-        # Normalize skills and job text
-        resume_skills = set([str(s).lower().strip() for s in skills if s])
-        job_text_lower = job_text.lower()
-        
-        # Count exact skill matches
-        matches = sum(1 for skill in resume_skills if skill in job_text_lower)
-        
-        if not resume_skills:
-            return 0
-        
-        # Calculate boost (up to 15 points)
-        match_ratio = matches / len(resume_skills)
-        boost = int(match_ratio * 15)
-        
-        return boost
-        
-    except Exception:
+    skills = resume_data.get('skills') or resume_data.get('skills_extracted') or resume_data.get('keywords') or []
+    if not isinstance(skills, list):
+        return ()
+    return tuple(str(s).lower().strip() for s in skills if s)
+
+
+def _skill_boost(skills: tuple[str, ...], job_text: str) -> int:
+    """
+    Skill boost from already-normalised resume skills.
+    """
+    # Normalize skills and job text
+    resume_skills = set(skills)
+    job_text_lower = job_text.lower()
+    
+    if not resume_skills:
         return 0
+    
+    # Count exact skill matches
+    matches = sum(1 for skill in resume_skills if skill in job_text_lower)
+    
+    # Calculate boost (up to 15 points)
+    match_ratio = matches / len(resume_skills)
+    return int(match_ratio * 15)
 
 
-def _fallback_keyword_match(resume_data: dict, job_text: str) -> int:
+def _keyword_match(resume_skills: tuple[str, ...], job_text: str) -> int:
     """
-    Simple keyword-based matching as fallback.
+    Keyword overlap score from already-normalised resume skills.
     """
-    try:
-        import re
-        
-        # Extract skills from resume
-        skills = resume_data.get('skills') or resume_data.get('skills_extracted') or resume_data.get('keywords') or []
-        if not isinstance(skills, list):
-            return 0
-        
-        resume_skills = [str(s).lower().strip() for s in skills if s]
-        
-        # Extract words from job text
-        job_words = set([w.strip().lower() for w in re.findall(r"\b\w+\b", job_text)])
-        
-        if not resume_skills or not job_words:
-            return 0
-        
-        # Calculate overlap
-        overlap = sum(1 for skill in resume_skills if skill in job_words)
-        score = int(min(100, (overlap / max(len(resume_skills), 1)) * 100))
-        
-        return score
-        
-    except Exception:
+    # Extract words from job text
+    job_words = set(_WORD_RE.findall(job_text.lower()))
+    
+    if not resume_skills or not job_words:
         return 0
+    
+    # Calculate overlap
+    overlap = sum(1 for skill in resume_skills if skill in job_words)
+    return int(min(100, (overlap / max(len(resume_skills), 1)) * 100))
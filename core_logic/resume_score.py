@@ -0,0 +1,37 @@
+"""
+Completeness score (0-100) of extracted resume data
+"""
+import numpy as np
+
+# Resume score (0-100): (field, points per item, max points)
+RESUME_SCORE_WEIGHTS = (
+    ('skills', 3, 30),           # max 10 skills
+    ('work_experience', 8, 25),  # max ~3 experiences
+    ('education', 10, 20),       # max 2 degrees
+    ('certifications', 5, 15),   # max 3 certs
+    ('projects', 5, 10),         # max 2 projects
+)
+
+_SCORE_POINTS = np.array([points for _, points, _ in RESUME_SCORE_WEIGHTS], dtype=np.int32)
+_SCORE_CAPS = np.array([cap for _, _, cap in RESUME_SCORE_WEIGHTS], dtype=np.int32)
+
+
+def item_count(value) -> int:
+    """Number of entries in an extracted field (a non-list value counts as one)"""
+    return len(value) if isinstance(value, list) else (1 if value else 0)
+
+
+def calculate_resume_score(analysis_result: dict) -> int:
+    """Score how complete the extracted resume data is"""
+    score = sum(min(cap, item_count(analysis_result.get(key)) * points)
+                for key, points, cap in RESUME_SCORE_WEIGHTS)
+    return min(100, score)
+
+
+def calculate_resume_scores(analysis_results: list[dict]) -> np.ndarray:
+    """calculate_resume_score() for many resumes at once, as one array operation"""
+    counts = np.array(
+        [[item_count(result.get(key)) for key, _, _ in RESUME_SCORE_WEIGHTS] for result in analysis_results],
+        dtype=np.int32,
+    ).reshape(-1, len(RESUME_SCORE_WEIGHTS))
+    return np.minimum(100, np.minimum(_SCORE_CAPS, counts * _SCORE_POINTS).sum(axis=1))
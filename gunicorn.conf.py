@@ -0,0 +1,17 @@
+"""
+Gunicorn settings for serving Synapse behind nginx
+"""
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+# gevent workers keep many slow requests (Gemini calls, uploads) in flight per process.
+# Socket.IO needs sticky sessions plus SOCKETIO_MESSAGE_QUEUE before running more than one worker.
+worker_class = 'geventwebsocket.gunicorn.workers.GeventWebSocketWorker'
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_connections = 1000
+timeout = 60
+backlog = 4096
+
+accesslog = '-'
+errorlog = '-'
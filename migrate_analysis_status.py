@@ -0,0 +1,33 @@
+"""
+Migration script to add the background analysis status and ATS flag to ResumeAnalysis
+Run this file to update your database schema
+"""
+from app import app, db
+from sqlalchemy import text
+
+with app.app_context():
+    with db.engine.connect() as conn:
+        # Check and add status column (existing analyses are already complete)
+        try:
+            conn.execute(text("ALTER TABLE resume_analyses ADD COLUMN status VARCHAR(20) DEFAULT 'completed'"))
+            conn.commit()
+            print("✓ Added status column")
+        except Exception as e:
+            if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
+                print("• status column already exists")
+            else:
+                print(f"Error adding status: {e}")
+        
+        # Check and add score_ats column (whether a queued analysis also computes the ATS score)
+        try:
+            conn.execute(text("ALTER TABLE resume_analyses ADD COLUMN score_ats BOOLEAN DEFAULT 0"))
+            conn.commit()
+            print("✓ Added score_ats column")
+        except Exception as e:
+            conn.rollback()
+            if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
+                print("• score_ats column already exists")
+            else:
+                print(f"Error adding score_ats: {e}")
+    
+    print("\n✅ Migration completed successfully!")
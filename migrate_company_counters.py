@@ -0,0 +1,33 @@
+"""
+Migration script to add the denormalized job/applicant counters to companies
+Run this file to update your database schema
+"""
+from app import app, db, recount_company_counters
+from sqlalchemy import text
+
+COLUMNS = ['total_jobs_count', 'total_applicants_count']
+
+with app.app_context():
+    with db.engine.connect() as conn:
+        for column in COLUMNS:
+            try:
+                conn.execute(text(f"ALTER TABLE companies ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+                conn.commit()
+                print(f"✓ Added {column} column")
+            except Exception as e:
+                conn.rollback()
+                if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
+                    print(f"• {column} column already exists")
+                else:
+                    print(f"Error adding {column}: {e}")
+    
+    # Recount from the source tables (safe to re-run if the counters ever drift)
+    try:
+        recount_company_counters()
+        db.session.commit()
+        print("✓ Backfilled company counters")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error backfilling counters: {e}")
+    
+    print("\n✅ Migration completed successfully!")
@@ -0,0 +1,27 @@
+"""
+Migration script to add the indexes used by the hot matches, jobs, resume and roadmap queries
+Run this file to update your database schema
+"""
+from app import app, db
+from sqlalchemy import text
+
+INDEXES = [
+    ("ix_match_user_match_hidden", "matches (user_id, is_match, is_hidden_by_user)"),
+    ("ix_match_job_match_status", "matches (job_id, is_match, application_status)"),
+    ("ix_job_active_open", "jobs (is_active, applications_closed)"),
+    ("ix_job_company", "jobs (company_id)"),
+    ("ix_resume_user", "resume_analyses (user_id)"),
+    ("ix_roadmap_user_created", "career_roadmaps (user_id, created_at)"),
+]
+
+with app.app_context():
+    with db.engine.connect() as conn:
+        for name, target in INDEXES:
+            try:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+                conn.commit()
+                print(f"✓ Ensured index {name}")
+            except Exception as e:
+                print(f"Error creating {name}: {e}")
+    
+    print("\n✅ Migration completed successfully!")
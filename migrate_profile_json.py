@@ -0,0 +1,25 @@
+"""
+Migration script for the profile list columns (projects, training_courses, work_samples)
+now mapped as JSON. SQLite keeps the existing TEXT columns; PostgreSQL converts them.
+Run this file to update your database schema
+"""
+from app import app, db
+from sqlalchemy import text
+
+COLUMNS = ['projects', 'training_courses', 'work_samples']
+
+with app.app_context():
+    with db.engine.connect() as conn:
+        for column in COLUMNS:
+            try:
+                # Empty strings were never valid JSON; treat them as "no items"
+                conn.execute(text(f"UPDATE users SET {column} = NULL WHERE {column} = ''"))
+                if db.engine.dialect.name == 'postgresql':
+                    conn.execute(text(f"ALTER TABLE users ALTER COLUMN {column} TYPE JSON USING {column}::json"))
+                conn.commit()
+                print(f"✓ Migrated {column}")
+            except Exception as e:
+                conn.rollback()
+                print(f"Error migrating {column}: {e}")
+    
+    print("\n✅ Migration completed successfully!")
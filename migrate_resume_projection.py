@@ -0,0 +1,50 @@
+"""
+Migration script to add precomputed resume projections to ResumeAnalysis
+Run this file to update your database schema and backfill existing analyses
+"""
+import json
+from app import app, db, store_resume_projection
+from models import ResumeAnalysis
+from sqlalchemy import text
+
+COLUMNS = [
+    ("top_skills", "VARCHAR(255)"),
+    ("skill_count", "INTEGER"),
+    ("exp_count", "INTEGER"),
+    ("edu_count", "INTEGER"),
+]
+
+with app.app_context():
+    with db.engine.connect() as conn:
+        for name, column_type in COLUMNS:
+            try:
+                conn.execute(text(f"ALTER TABLE resume_analyses ADD COLUMN {name} {column_type}"))
+                conn.commit()
+                print(f"✓ Added {name} column")
+            except Exception as e:
+                if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
+                    print(f"• {name} column already exists")
+                else:
+                    print(f"Error adding {name}: {e}")
+        
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_resume_score ON resume_analyses (analysis_score)"))
+        conn.commit()
+        print("✓ Ensured index ix_resume_score")
+    
+    # Backfill projections from the stored extracted JSON
+    updated = 0
+    for analysis in ResumeAnalysis.query.filter(ResumeAnalysis.extracted_json.isnot(None)).all():
+        try:
+            extracted = json.loads(analysis.extracted_json)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        # Keep summaries the user has edited by hand
+        summary = analysis.profile_summary_text
+        store_resume_projection(analysis, extracted)
+        if summary:
+            analysis.profile_summary_text = summary
+        updated += 1
+    db.session.commit()
+    print(f"✓ Backfilled {updated} resume analyses")
+    
+    print("\n✅ Migration completed successfully!")
@@ -20,11 +20,11 @@ class User(UserMixin, db.Model):
     
     # Additional profile fields
     career_objective = db.Column(db.Text)
-    projects = db.Column(db.Text)  # JSON string storing array of projects
+    projects = db.Column(db.JSON(none_as_null=True))  # Array of projects
     extracurriculars = db.Column(db.Text)
-    training_courses = db.Column(db.Text)  # JSON string storing array of courses
+    training_courses = db.Column(db.JSON(none_as_null=True))  # Array of courses
     portfolio_url = db.Column(db.String(500))
-    work_samples = db.Column(db.Text)  # JSON string storing array of links
+    work_samples = db.Column(db.JSON(none_as_null=True))  # Array of links
     accomplishments = db.Column(db.Text)
     phone = db.Column(db.String(20))
     location = db.Column(db.String(200))
@@ -34,8 +34,9 @@ class User(UserMixin, db.Model):
     # Relationship to the user's resume analysis (one-to-one)
     resume = db.relationship('ResumeAnalysis', backref='user', uselist=False, cascade='all, delete-orphan')
     
-    # Relationship to the user's matches (one-to-many)
-    matches = db.relationship('Match', backref='user', cascade='all, delete-orphan')
+    # Relationship to the user's matches (one-to-many); dynamic so callers can
+    # query a subset instead of loading every swipe
+    matches = db.relationship('Match', backref='user', cascade='all, delete-orphan', lazy='dynamic')
     
     def __repr__(self):
         return f'<User {self.email}>'
@@ -56,8 +57,12 @@ class Company(UserMixin, db.Model):
     # User type identifier
     user_type = db.Column(db.String(20), default='company')
     
+    # Denormalized dashboard counters, kept in step with Job and Match writes in app.py
+    total_jobs_count = db.Column(db.Integer, default=0, nullable=False)
+    total_applicants_count = db.Column(db.Integer, default=0, nullable=False)
+    
     # Relationship to jobs posted by this company (one-to-many)
-    jobs = db.relationship('Job', backref='company', cascade='all, delete-orphan')
+    jobs = db.relationship('Job', backref='company', cascade='all, delete-orphan', lazy='dynamic')
     
     def __repr__(self):
         return f'<Company {self.company_name}>'
@@ -87,10 +92,30 @@ class ResumeAnalysis(db.Model):
     # Profile summary for matching (can be auto-generated or manually edited)
     profile_summary_text = db.Column(db.Text)
     
+    # Projections of extracted_json computed at write time so list pages don't parse it
+    top_skills = db.Column(db.String(255))  # First few skills, newline-separated
+    skill_count = db.Column(db.Integer)
+    exp_count = db.Column(db.Integer)
+    edu_count = db.Column(db.Integer)
+    
+    # Background analysis state: processing, completed, failed
+    status = db.Column(db.String(20), default='completed')
+    score_ats = db.Column(db.Boolean, default=False)  # Whether the queued analysis also computes the ATS score
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes for ranking candidates by resume score and the per-user lookup
+    __table_args__ = (
+        db.Index('ix_resume_score', 'analysis_score'),
+        db.Index('ix_resume_user', 'user_id'),
+    )
+    
+    @property
+    def top_skill_list(self):
+        return self.top_skills.split('\n') if self.top_skills else []
+    
     def __repr__(self):
         return f'<ResumeAnalysis for User {self.user_id}>'
 
@@ -120,6 +145,12 @@ class Job(db.Model):
     # Relationship to matches (one-to-many)
     matches = db.relationship('Match', backref='job', cascade='all, delete-orphan')
     
+    # Indexes for the "open jobs" filter used by the swipe feed and per-company job lookups
+    __table_args__ = (
+        db.Index('ix_job_active_open', 'is_active', 'applications_closed'),
+        db.Index('ix_job_company', 'company_id'),
+    )
+    
     def __repr__(self):
         return f'<Job {self.title} at {self.company.company_name}>'
 
@@ -149,7 +180,12 @@ class Match(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Unique constraint: a user can only swipe once per job
-    __table_args__ = (db.UniqueConstraint('user_id', 'job_id', name='unique_user_job_match'),)
+    # Composite indexes cover the job seeker matches list and the company applicant queries
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'job_id', name='unique_user_job_match'),
+        db.Index('ix_match_user_match_hidden', 'user_id', 'is_match', 'is_hidden_by_user'),
+        db.Index('ix_match_job_match_status', 'job_id', 'is_match', 'application_status'),
+    )
     
     def __repr__(self):
         return f'<Match User:{self.user_id} Job:{self.job_id} Like:{self.is_match} Status:{self.application_status} Score:{self.match_score}>'
@@ -175,6 +211,9 @@ class CareerRoadmap(db.Model):
     # Relationship to user
     user = db.relationship('User', backref=db.backref('roadmaps', lazy=True, cascade='all, delete-orphan'))
     
+    # Index for listing a user's roadmaps newest first
+    __table_args__ = (db.Index('ix_roadmap_user_created', 'user_id', 'created_at'),)
+    
     def __repr__(self):
         return f'<CareerRoadmap User:{self.user_id} Target:{self.target_job}>'
 
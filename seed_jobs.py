@@ -4,7 +4,7 @@ Run this script to populate the database with sample companies and jobs.
 Usage: python seed_jobs.py
 """
 
-from app import app, db, bcrypt
+from app import app, db, hash_password, recount_company_counters
 from models import User, Company, Job, ResumeAnalysis, Match
 from datetime import datetime
 
@@ -259,7 +259,7 @@ def seed_database():
         print("\n📊 Creating companies...")
         companies = []
         for company_data in sample_companies:
-            hashed_password = bcrypt.generate_password_hash(company_data['password']).decode('utf-8')
+            hashed_password = hash_password(company_data['password'])
             company = Company(
                 email=company_data['email'],
                 password_hash=hashed_password,
@@ -293,13 +293,16 @@ def seed_database():
             db.session.add(job)
             print(f"  + {job_data['title']} at {company.company_name}")
         
+        # Jobs are added directly, so set the dashboard counters from what now exists
+        db.session.flush()
+        recount_company_counters()
         db.session.commit()
         print(f"✓ Created {len(sample_jobs)} jobs")
         
         # Create sample users
         print("\n👥 Creating sample job seekers...")
         for user_data in sample_users:
-            hashed_password = bcrypt.generate_password_hash(user_data['password']).decode('utf-8')
+            hashed_password = hash_password(user_data['password'])
             user = User(
                 email=user_data['email'],
                 password_hash=hashed_password,
@@ -0,0 +1,21 @@
+"""
+Production entry point for Synapse
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+# gevent must patch the standard library before Flask, SQLAlchemy or requests are imported
+from gevent import monkey
+monkey.patch_all()
+
+import os
+
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'gevent')
+
+# The Gemini client talks gRPC, whose C core needs its own gevent integration
+# or every model call blocks the whole worker
+try:
+    import grpc.experimental.gevent as grpc_gevent
+    grpc_gevent.init_gevent()
+except ImportError:
+    pass
+
+from app import app, socketio  # noqa: E402,F401